@@ -2,6 +2,7 @@ using System;
 using System.Collections.Generic;
 using UnityEngine;
 using Newtonsoft.Json; // Asegúrate de incluir este using
+using Newtonsoft.Json.Linq;
 
 [System.Serializable]
 public class StepData : MonoBehaviour
@@ -20,7 +21,16 @@ public class StepData : MonoBehaviour
         // Intentar deserializar usando Newtonsoft.Json
         try
         {
-            mapData = JsonConvert.DeserializeObject<MapData>(json);
+            // El servidor manda el formato delta (ver Servers/DELTA_FORMAT.md); /full sigue mandando MapData completo
+            JObject root = JObject.Parse(json);
+            if ((string)root["format"] == "delta")
+            {
+                mapData = DeltaDecoder.Decode(root.ToObject<DeltaPayload>());
+            }
+            else
+            {
+                mapData = root.ToObject<MapData>();
+            }
             Debug.Log("JSON deserializado correctamente con Newtonsoft.Json.");
             mapData.InitializeDictionaries(); // Inicializar diccionarios
 
@@ -285,3 +295,189 @@ public class OpenDoorsStepData
     public int step;                        // Número del paso
     public List<List<int[]>> data;          // Lista de pares de celdas abiertas
 }
+
+
+// Formato delta: keyframes completos cada keyframe_interval pasos y, entre ellos, solo los cambios
+// Esquema completo en Servers/DELTA_FORMAT.md
+[Serializable]
+public class DeltaPayload
+{
+    public string format;               // Siempre "delta"
+    public int version;                 // Versión del formato (1)
+    public int keyframe_interval;       // Pasos entre keyframes
+    public int steps;                   // Número de pasos
+    public DeltaFrame[] frames;         // Un frame por paso
+}
+
+[Serializable]
+public class DeltaFrame
+{
+    public bool key;                    // true si es keyframe (estado completo)
+    public int? step;                   // Número del paso (solo en keyframes; en deltas es el anterior + 1)
+    public int[][] agents;              // [agent_id, x, y, lleva_puffle, (target_x, target_y)] de todos los agentes
+    public int[][] moved;               // Solo los agentes que cambiaron
+    public int[][] fire;                // [x, y] de todas las celdas con fuego
+    public int[][] smoke;               // [x, y] de todas las celdas con humo
+    public int[][] cells;               // [x, y, estado] de las celdas que cambiaron (0 nada, 1 humo, 2 fuego)
+    public int[][] pois;                // [x, y, tipo] (2 víctima, 1 falsa alarma) cuando cambian
+    public int[][] open_doors;          // [x1, y1, x2, y2] de todas las puertas abiertas
+    public int[][] doors_closed;        // Puertas que dejaron de estar abiertas
+    public int[][] doors_opened;        // Puertas nuevas
+    public int[][] destroyed_doors;     // [x1, y1, x2, y2, dirección] (0 up, 1 left, 2 down, 3 right)
+    public int[][] destroyed_walls;     // [x, y, vecino_x, vecino_y, dirección]
+    public int? victims_dead;           // Contadores del paso (si faltan valen 0)
+    public int? agents_dead;
+    public int? saved_lifes;
+    public int? damage;                 // Daño estructural restante (si falta, el del paso anterior)
+}
+
+// Reconstruye MapData completo a partir del formato delta
+public static class DeltaDecoder
+{
+    private static readonly string[] Directions = { "up", "left", "down", "right" };
+
+    public static MapData Decode(DeltaPayload payload)
+    {
+        if (payload.format != "delta" || payload.version != 1)
+            throw new Exception($"Formato de trayectoria no soportado: {payload.format} v{payload.version}");
+
+        int count = payload.frames.Length;
+        MapData mapData = new MapData
+        {
+            agents = new AgentsStepData[count],
+            fire_expansion = new FireStepData[count],
+            smoke_expansion = new SmokeStepData[count],
+            pois = new POIStepData[count],
+            victims_dead = new StepCountData[count],
+            agents_dead = new StepCountData[count],
+            saved_lifes = new StepCountData[count],
+            structural_damage_left = new StructuralDamageData[count],
+            destroyed_doors = new DestroyedDoorsStepData[count],
+            destroyed_walls = new DestroyedWallsStepData[count],
+            open_doors = new OpenDoorsStepData[count]
+        };
+
+        // Estado actual: agentes por id, estado de cada celda y puertas abiertas
+        SortedDictionary<int, int[]> agents = new SortedDictionary<int, int[]>();
+        Dictionary<(int, int), int> cells = new Dictionary<(int, int), int>();
+        int[][] pois = new int[0][];
+        HashSet<(int, int, int, int)> doors = new HashSet<(int, int, int, int)>();
+        int step = 0;
+        int damage = 0;
+
+        for (int i = 0; i < count; i++)
+        {
+            DeltaFrame frame = payload.frames[i];
+            step = frame.step ?? step + 1;
+
+            if (frame.agents != null)
+            {
+                agents.Clear();
+                foreach (var row in frame.agents) agents[row[0]] = row;
+            }
+            if (frame.moved != null)
+            {
+                foreach (var row in frame.moved) agents[row[0]] = row;
+            }
+
+            if (frame.fire != null || frame.smoke != null)
+            {
+                cells.Clear();
+                if (frame.smoke != null) foreach (var pos in frame.smoke) cells[(pos[0], pos[1])] = 1;
+                if (frame.fire != null) foreach (var pos in frame.fire) cells[(pos[0], pos[1])] = 2;
+            }
+            if (frame.cells != null)
+            {
+                foreach (var cell in frame.cells)
+                {
+                    if (cell[2] == 0) cells.Remove((cell[0], cell[1]));
+                    else cells[(cell[0], cell[1])] = cell[2];
+                }
+            }
+
+            if (frame.pois != null) pois = frame.pois;
+
+            if (frame.open_doors != null)
+            {
+                doors.Clear();
+                foreach (var row in frame.open_doors) doors.Add((row[0], row[1], row[2], row[3]));
+            }
+            if (frame.doors_closed != null)
+            {
+                foreach (var row in frame.doors_closed) doors.Remove((row[0], row[1], row[2], row[3]));
+            }
+            if (frame.doors_opened != null)
+            {
+                foreach (var row in frame.doors_opened) doors.Add((row[0], row[1], row[2], row[3]));
+            }
+
+            damage = frame.damage ?? damage;
+
+            // Paso i de cada canal de MapData
+            List<AgentDataStep> agentList = new List<AgentDataStep>();
+            foreach (var row in agents.Values)
+            {
+                agentList.Add(new AgentDataStep
+                {
+                    agent_id = row[0],
+                    position = new[] { row[1], row[2] },
+                    carry_state = row[3],
+                    target = row.Length > 4 ? new[] { row[4], row[5] } : null
+                });
+            }
+            mapData.agents[i] = new AgentsStepData { step = step, data = agentList.ToArray() };
+
+            List<FireData> fireList = new List<FireData>();
+            List<SmokeData> smokeList = new List<SmokeData>();
+            foreach (var cell in cells)
+            {
+                int[] position = new[] { cell.Key.Item1, cell.Key.Item2 };
+                if (cell.Value == 2) fireList.Add(new FireData { position = position, state = "fire" });
+                else smokeList.Add(new SmokeData { position = position, state = "smoke" });
+            }
+            mapData.fire_expansion[i] = new FireStepData { step = step, data = fireList.ToArray() };
+            mapData.smoke_expansion[i] = new SmokeStepData { step = step, data = smokeList.ToArray() };
+
+            List<POIData> poiList = new List<POIData>();
+            foreach (var row in pois)
+            {
+                poiList.Add(new POIData { position = new[] { row[0], row[1] }, type = row[2] == 2 ? "victim" : "false_alarm" });
+            }
+            mapData.pois[i] = new POIStepData { step = step, data = poiList.ToArray() };
+
+            mapData.victims_dead[i] = new StepCountData { step = step, count = frame.victims_dead ?? 0 };
+            mapData.agents_dead[i] = new StepCountData { step = step, count = frame.agents_dead ?? 0 };
+            mapData.saved_lifes[i] = new StepCountData { step = step, count = frame.saved_lifes ?? 0 };
+            mapData.structural_damage_left[i] = new StructuralDamageData { step = step, value = damage };
+
+            List<DestroyedDoorData> destroyedDoors = new List<DestroyedDoorData>();
+            if (frame.destroyed_doors != null)
+            {
+                foreach (var row in frame.destroyed_doors)
+                {
+                    destroyedDoors.Add(new DestroyedDoorData { cell1 = new[] { row[0], row[1] }, cell2 = new[] { row[2], row[3] }, direction = Directions[row[4]] });
+                }
+            }
+            mapData.destroyed_doors[i] = new DestroyedDoorsStepData { step = step, data = destroyedDoors.ToArray() };
+
+            List<DestroyedWallData> destroyedWalls = new List<DestroyedWallData>();
+            if (frame.destroyed_walls != null)
+            {
+                foreach (var row in frame.destroyed_walls)
+                {
+                    destroyedWalls.Add(new DestroyedWallData { cell = new[] { row[0], row[1] }, neighbor = new[] { row[2], row[3] }, direction = Directions[row[4]] });
+                }
+            }
+            mapData.destroyed_walls[i] = new DestroyedWallsStepData { step = step, data = destroyedWalls.ToArray() };
+
+            List<List<int[]>> doorList = new List<List<int[]>>();
+            foreach (var door in doors)
+            {
+                doorList.Add(new List<int[]> { new[] { door.Item1, door.Item2 }, new[] { door.Item3, door.Item4 } });
+            }
+            mapData.open_doors[i] = new OpenDoorsStepData { step = step, data = doorList };
+        }
+
+        return mapData;
+    }
+}
@@ -0,0 +1,217 @@
+# Librerías
+from mesa import Agent
+
+from events import INFO
+
+# Clase Agente
+class PenguinAgent(Agent):
+    def __init__(self, unique_id, model, target=None):
+        super().__init__(unique_id, model)
+        self.target = target
+        self.action_points = 4
+        self.lleva_puffle = 1 #1 nada, 2 es víctima esto es para que el num de acciones de movimientos se multiplique y no tenga que haber un if
+        self.path = []
+
+        # Estado del plan actual para solo repararlo cuando cambie el tablero
+        self.plan_target = None
+        self.plan_pos = None
+        self.plan_lleva = 1
+        self.plan_version = 0
+
+    def step(self):
+        if self.target is not None:
+            # Reutilizar el camino si sigue siendo válido, si no recalcularlo
+            if not self.plan_is_valid():
+                self.path, total_steps = self.dijkstra(self.pos, self.target.pos)
+                self.save_plan()
+
+            # Move along the path as long as there are action points and the target hasn't been reached
+            while self.action_points >= 1 and self.pos != self.target.pos and self.path:
+                cost = self.clear_path(self.pos, self.path[0])
+                if self.action_points < cost:
+                    break #si los puntos de acción exceden el costo de limpiar el camino no avanza
+                self.action_points -= cost
+                self.model.grid.move_agent(self, self.path.pop(0))
+            self.plan_pos = self.pos
+
+        # Al llegar al objetivo
+        if self.target is not None and self.pos == self.target.pos:
+            # si es una víctima (2)
+            if self.target.poi == 2:
+                self.lleva_puffle = 2  # El agente lleva al puffle
+                closest_exit, self.path = self.find_closest_exit()
+                self.model.cells[self.pos[0]][self.pos[1]].poi = 0
+                self.remove_from_interest_points(self.target)
+                self.target = closest_exit
+                self.save_plan()
+
+            # si el objetivo es una salida y lleva un puffle
+            elif self.model.cells[self.pos[0]][self.pos[1]] in self.model.outside and self.lleva_puffle == 2:
+                self.lleva_puffle = 1  # Drop the victim
+                self.model.saved_lifes += 1
+                self.target = None
+
+            # Case: Target is a false alarm
+            elif self.target.poi == 1:
+                self.model.cells[self.pos[0]][self.pos[1]].poi = 0
+                self.remove_from_interest_points(self.target)
+                self.target = None
+
+            # Case: Target is a fire
+            elif self.target.fire == 2:
+                self.target = None
+
+        # Replenish action points
+        self.calculate_action_points()
+
+    def find_closest_exit(self):
+        """Find the closest exit and the path to it with a single search from the agent."""
+        exits = [exit_cell.pos for exit_cell in self.model.outside]
+        exit_pos, path, _ = self.model.path_engine.nearest(self.pos, exits, self.model.edge_cost_fn(self.lleva_puffle))
+        if exit_pos is None:
+            return None, []
+        return self.model.cells[exit_pos[0]][exit_pos[1]], path
+
+    def remove_from_interest_points(self, point):
+        """Remove a point from the interest points list if it exists."""
+        if point in self.model.interest_points:
+            self.model.interest_points.remove(point)
+
+    def save_plan(self):
+        """Guarda el estado con el que se calculó self.path."""
+        self.plan_target = self.target
+        self.plan_pos = self.pos
+        self.plan_lleva = self.lleva_puffle
+        self.plan_version = self.model.board_version
+
+    def plan_is_valid(self):
+        """El camino actual sigue siendo el mejor si no cambió el objetivo, la posición ni el tablero a lo largo de él."""
+        if not self.path or self.plan_target is not self.target or self.plan_pos != self.pos or self.plan_lleva != self.lleva_puffle:
+            return False
+        return self.model.path_still_valid(self.path, self.plan_version)
+
+    def dijkstra(self, start, end):
+        """Camino más corto y costo total de start a end usando los campos de distancia del modelo."""
+        return self.model.shortest_path(start, end, self.lleva_puffle)
+
+    def calculate_action_points(self):
+        if self.action_points + 4 > 8:
+            self.action_points = 8
+        else:
+            self.action_points += 4
+
+    # def remove_wall(self, start_pos, end_pos):
+    #   """
+    #   Removes a wall between two cells.
+    #   """
+    #   x1, y1 = start_pos
+    #   x2, y2 = end_pos
+
+    #   # Determine the direction of the wall to remove
+    #   if x1 == x2:
+    #       if y1 < y2:
+    #           direction = "right"
+    #           opposite_direction = "left"
+    #       else:
+    #           direction = "left"
+    #           opposite_direction = "right"
+    #   elif y1 == y2:
+    #       if x1 < x2:
+    #           direction = "down"
+    #           opposite_direction = "up"
+    #       else:
+    #           direction = "up"
+    #           opposite_direction = "down"
+
+    #   # Remove the wall between the cells
+    #   setattr(self.cells[x1][y1], direction, False)
+    #   setattr(self.cells[x2][y2], opposite_direction, False)
+
+    #   # Register the destroyed wall
+    #   wall_info = {
+    #       "cell": (x1, y1),
+    #       "neighbor": (x2, y2),
+    #       "direction": direction
+    #   }
+    #   self.destroyed_walls.append(wall_info)
+
+    #   print(f"Pared removida entre {start_pos} y {end_pos} en dirección {direction}")
+
+    def clear_path(self, start, end):
+        """Calcula el costo de despejar el camino de start a end, incluyendo puertas, paredes y fuego."""
+        action_points_cost = 0
+
+        # Verificar que las coordenadas del destino estén dentro de los límites
+        if not (0 <= end[0] < len(self.model.cells) and 0 <= end[1] < len(self.model.cells[0])):
+            return action_points_cost
+
+        # Determinar la dirección del movimiento
+        if start[0] < end[0]:  # Moverse hacia abajo
+            action_points_cost += self.calculate_cost_and_clear(start, end, "down", "up")
+        elif start[0] > end[0]:  # Moverse hacia arriba
+            action_points_cost += self.calculate_cost_and_clear(start, end, "up", "down")
+        elif start[1] < end[1]:  # Moverse hacia la derecha
+            action_points_cost += self.calculate_cost_and_clear(start, end, "right", "left")
+        elif start[1] > end[1]:  # Moverse hacia la izquierda
+            action_points_cost += self.calculate_cost_and_clear(start, end, "left", "right")
+
+        # Agregar costo adicional si el destino tiene fuego
+        if self.model.cells[end[0]][end[1]].fire == 2:
+            action_points_cost += 1
+            self.model.set_fire(self.model.cells[end[0]][end[1]], 0)
+
+        # Añadir el costo de llevar una víctima
+        action_points_cost += 1 * self.lleva_puffle
+
+        return action_points_cost
+
+    def calculate_cost_and_clear(self, start, end, direction, opposite_direction):
+      """
+      Calculates the cost of moving in a specific direction and performs necessary operations
+      to clear doors or walls.
+      """
+      cost = 0
+      current_cell = self.model.cells[start[0]][start[1]]
+      target_cell = self.model.cells[end[0]][end[1]]
+
+      # Initialize wall indices based on direction
+      wall_indices = {
+          "up": (0, 2),
+          "left": (1, 3),
+          "down": (2, 0),
+          "right": (3, 1)
+      }
+      wall_index, opposite_wall_index = wall_indices[direction]
+
+      # If there is a wall or door in the way
+      if getattr(current_cell, direction) or getattr(target_cell, opposite_direction):
+          # Check if it's a door
+          if end in current_cell.door:
+              # It's a door, costs 1 to move through
+              cost += 1
+              # Optionally, you can handle door opening here
+          else:
+              # It's a wall, agent needs to spend action points to damage it
+              # Each 2 action points reduce wall health by 1
+              if current_cell.wall_health[wall_index] > 0:
+                  cost += 2  # Cost to damage the wall by 1
+                  current_cell.wall_health[wall_index] -= 1
+                  target_cell.wall_health[opposite_wall_index] -= 1
+
+                  if current_cell.wall_health[wall_index] == 1:
+                      self.model.structural_damage_left -= 1  # Damage for the first time
+                      self.model.log.emit(INFO, "wall_damaged_agent", pos=current_cell.pos)
+                  elif current_cell.wall_health[wall_index] == 0:
+                      # Wall destroyed
+                      setattr(current_cell, direction, False)
+                      setattr(target_cell, opposite_direction, False)
+                      self.model.structural_damage_left -= 1  # Damage when destroyed
+                      self.model.remove_wall(start, end)
+                      self.model.log.emit(INFO, "wall_destroyed_agent", pos=current_cell.pos)
+              else:
+                  # Wall is already destroyed, no extra cost
+                  cost += 1  # Cost to move through the open space
+      else:
+          cost += 1  # Normal movement cost
+
+      return cost
@@ -0,0 +1,55 @@
+# Asignación de agentes a objetivos con costo total mínimo (algoritmo húngaro) sobre una matriz de costos
+INF = float('inf')
+
+
+# Función que resuelve el problema de asignación para una matriz rectangular (lista de filas)
+# Regresa una lista de pares (fila, columna): cada fila y cada columna se usan a lo más una vez y se asignan
+# min(filas, columnas) pares con la menor suma de costos posible
+def hungarian(cost):
+    if not cost or not cost[0]:
+        return []
+    if len(cost) > len(cost[0]):
+        # El algoritmo necesita filas <= columnas; se resuelve la transpuesta
+        transposed = [list(column) for column in zip(*cost)]
+        return sorted((row, column) for column, row in hungarian(transposed))
+
+    # Versión O(n^2 m) con potenciales; índices desde 1, la columna 0 es auxiliar
+    n, m = len(cost), len(cost[0])
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    match = [0] * (m + 1)  # match[j] = fila asignada a la columna j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            delta = INF
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    current = cost[i0 - 1][j - 1] - u[i0] - v[j]
+                    if current < minv[j]:
+                        minv[j] = current
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Recorrer el camino aumentante de regreso
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    return sorted((match[j] - 1, j - 1) for j in range(1, m + 1) if match[j])
@@ -0,0 +1,228 @@
+# Formato binario de trayectorias: un registro de ancho fijo por paso y un índice de offsets al final,
+# para abrir el archivo con mmap y saltar directo al paso k sin leer los anteriores
+import json
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from board import DIRECTIONS, OFFSETS
+from trajectory import build_map_data
+
+MAGIC = b"PFTR"
+FORMAT_VERSION = 1
+
+# Encabezado: magic, versión, alto, ancho, máximo de agentes, pasos, offset del índice, bytes del resumen final
+HEADER = struct.Struct("<4sHBBHIQI")
+
+# Un agente: id, posición, carga (1 nada, 2 víctima) y objetivo (-1, -1 si no tiene)
+AGENT = np.dtype([("agent_id", "<u2"), ("x", "u1"), ("y", "u1"), ("lleva_puffle", "u1"), ("target_x", "i1"), ("target_y", "i1")])
+
+# Planos de bits del tablero (un bit por celda, en orden x * width + y)
+PLANES = (
+    "fire", "smoke", "victim", "false_alarm",
+    "door_right", "door_down",  # puertas abiertas hacia la celda de la derecha / de abajo
+    "destroyed_door_up", "destroyed_door_left", "destroyed_door_down", "destroyed_door_right",  # desde cell1
+    "destroyed_wall_up", "destroyed_wall_left", "destroyed_wall_down", "destroyed_wall_right",  # desde cell
+)
+PLANE = {name: i for i, name in enumerate(PLANES)}
+
+
+# Tipo de los registros de un archivo (depende del tamaño del tablero y del número de agentes)
+def record_dtype(height, width, max_agents):
+    return np.dtype([
+        ("step", "<u4"),
+        ("agent_count", "u1"),
+        ("agents", AGENT, (max_agents,)),
+        ("victims_dead", "<i2"),
+        ("agents_dead", "<i2"),
+        ("saved_lifes", "<i2"),
+        ("structural_damage_left", "<i2"),
+        ("planes", "u1", (len(PLANES), (height * width + 7) // 8)),
+    ])
+
+
+# Escritor de trayectorias binarias; tiene la misma interfaz que TrajectoryWriter (write / close)
+# Para una corrida se usa BinaryTrajectoryWriter.for_model, que toma el tamaño del tablero y los agentes del modelo
+class BinaryTrajectoryWriter():
+    def __init__(self, path, height, width, max_agents):
+        self.path = path
+        self.height = height
+        self.width = width
+        self.max_agents = max_agents
+        self.dtype = record_dtype(height, width, max_agents)
+        self.offsets = []
+        self.file = open(path, 'wb')
+        self._write_header(0, 0, 0)
+
+    @classmethod
+    def for_model(cls, path, model):
+        return cls(path, model.height, model.width, model.num_agents)
+
+    def _write_header(self, steps, index_offset, summary_size):
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.height, self.width, self.max_agents, steps, index_offset, summary_size))
+
+    def _plane(self, cells):
+        grid = np.zeros(self.height * self.width, dtype=bool)
+        for x, y in cells:
+            grid[x * self.width + y] = True
+        return np.packbits(grid)
+
+    def encode(self, record):
+        """Convierte un registro de paso (como los de trajectory.py) en un registro binario."""
+        if len(record["agents"]) > self.max_agents:
+            raise ValueError(f"El paso {record['step']} tiene {len(record['agents'])} agentes; el archivo admite {self.max_agents}")
+
+        row = np.zeros((), dtype=self.dtype)
+        row["step"] = record["step"]
+        row["agent_count"] = len(record["agents"])
+        for i, agent in enumerate(record["agents"]):
+            target = agent["target"] if agent["target"] is not None else (-1, -1)
+            row["agents"][i] = (agent["agent_id"], agent["position"][0], agent["position"][1], agent["lleva_puffle"], target[0], target[1])
+        for counter in ("victims_dead", "agents_dead", "saved_lifes", "structural_damage_left"):
+            row[counter] = record[counter]
+
+        cells = {name: [] for name in PLANES}
+        cells["fire"] = [cell["position"] for cell in record["fire_expansion"]]
+        cells["smoke"] = [cell["position"] for cell in record["smoke_expansion"]]
+        for poi in record["pois"]:
+            cells["victim" if poi["type"] == "victim" else "false_alarm"].append(poi["position"])
+        for start, end in record["open_doors"]:
+            start, end = sorted([tuple(start), tuple(end)])
+            cells["door_right" if start[0] == end[0] else "door_down"].append(start)
+        for door in record["destroyed_doors"]:
+            cells["destroyed_door_" + door["direction"]].append(door["cell1"])
+        for wall in record["destroyed_walls"]:
+            cells["destroyed_wall_" + wall["direction"]].append(wall["cell"])
+        for name, positions in cells.items():
+            row["planes"][PLANE[name]] = self._plane(positions)
+        return row
+
+    def write(self, record):
+        self.offsets.append(self.file.tell())
+        self.file.write(self.encode(record).tobytes())
+
+    def close(self, summary=None):
+        """Escribe el índice de offsets (y el resumen, si se da) y completa el encabezado."""
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.offsets, dtype="<u8").tobytes())
+        summary_bytes = json.dumps(summary).encode('utf-8') if summary is not None else b""
+        self.file.write(summary_bytes)
+        self.file.seek(0)
+        self._write_header(len(self.offsets), index_offset, len(summary_bytes))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self.file.closed:
+            self.file.close()
+
+
+# Lector de trayectorias binarias con mmap: trajectory[k] solo lee el registro del paso k
+class BinaryTrajectory():
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.height, self.width, self.max_agents, steps, index_offset, summary_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} no es una trayectoria binaria v{FORMAT_VERSION}")
+        if index_offset == 0:
+            raise ValueError(f"{path} está incompleto: la corrida no cerró el archivo")
+
+        self.dtype = record_dtype(self.height, self.width, self.max_agents)
+        self.offsets = np.frombuffer(self.buffer, dtype="<u8", count=steps, offset=index_offset)
+        summary_start = index_offset + self.offsets.nbytes
+        self.summary = json.loads(bytes(self.buffer[summary_start:summary_start + summary_size])) if summary_size else None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def raw(self, k):
+        """Registro del paso k como arreglo estructurado de NumPy (vista del archivo, sin copiar)."""
+        return np.frombuffer(self.buffer, dtype=self.dtype, count=1, offset=int(self.offsets[k]))[0]
+
+    def _cells(self, row, name):
+        grid = np.unpackbits(row["planes"][PLANE[name]])[:self.height * self.width]
+        return [[int(i) // self.width, int(i) % self.width] for i in np.flatnonzero(grid)]
+
+    def __getitem__(self, k):
+        """Registro del paso k con el mismo formato que los de trajectory.py (celdas en orden de posición)."""
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        row = self.raw(k)
+
+        agents = []
+        for agent in row["agents"][:row["agent_count"]]:
+            agents.append({
+                "agent_id": int(agent["agent_id"]),
+                "position": [int(agent["x"]), int(agent["y"])],
+                "lleva_puffle": int(agent["lleva_puffle"]),
+                "target": [int(agent["target_x"]), int(agent["target_y"])] if agent["target_x"] >= 0 else None
+            })
+
+        pois = [{"position": pos, "type": "victim"} for pos in self._cells(row, "victim")]
+        pois += [{"position": pos, "type": "false_alarm"} for pos in self._cells(row, "false_alarm")]
+        pois.sort(key=lambda poi: poi["position"])
+
+        open_doors = [[pos, [pos[0], pos[1] + 1]] for pos in self._cells(row, "door_right")]
+        open_doors += [[pos, [pos[0] + 1, pos[1]]] for pos in self._cells(row, "door_down")]
+        open_doors.sort()
+
+        destroyed_doors = []
+        destroyed_walls = []
+        for direction, (dx, dy) in zip(DIRECTIONS, OFFSETS):
+            for x, y in self._cells(row, "destroyed_door_" + direction):
+                destroyed_doors.append({"cell1": [x, y], "cell2": [x + dx, y + dy], "direction": direction})
+            for x, y in self._cells(row, "destroyed_wall_" + direction):
+                destroyed_walls.append({"cell": [x, y], "neighbor": [x + dx, y + dy], "direction": direction})
+
+        return {
+            "type": "step",
+            "step": int(row["step"]),
+            "agents": agents,
+            "fire_expansion": [{"position": pos, "state": "fire"} for pos in self._cells(row, "fire")],
+            "smoke_expansion": [{"position": pos, "state": "smoke"} for pos in self._cells(row, "smoke")],
+            "pois": pois,
+            "victims_dead": int(row["victims_dead"]),
+            "agents_dead": int(row["agents_dead"]),
+            "saved_lifes": int(row["saved_lifes"]),
+            "structural_damage_left": int(row["structural_damage_left"]),
+            "destroyed_doors": destroyed_doors,
+            "destroyed_walls": destroyed_walls,
+            "open_doors": open_doors,
+        }
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+    def to_map_data(self):
+        return build_map_data(self)
+
+    def export_json(self, path='simulation_data.json'):
+        """Exporta la trayectoria como el simulation_data.json de siempre."""
+        with open(path, 'w') as json_file:
+            json.dump(self.to_map_data(), json_file, indent=4)
+
+    def close(self):
+        self.offsets = None  # suelta la vista antes de cerrar el mmap
+        self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Uso: python binary_trajectory.py simulation_steps.bin simulation_data.json
+if __name__ == '__main__':
+    with BinaryTrajectory(sys.argv[1]) as trajectory:
+        trajectory.export_json(sys.argv[2] if len(sys.argv) > 2 else 'simulation_data.json')
@@ -0,0 +1,170 @@
+# Librerías
+import numpy as np
+
+# Direcciones en el mismo orden que Cell.wall_health: arriba, izquierda, abajo, derecha
+DIRECTIONS = ("up", "left", "down", "right")
+OFFSETS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+OPPOSITE = (2, 3, 0, 1)
+
+# Bits de la máscara de paredes y puertas para cada dirección
+UP, LEFT, DOWN, RIGHT = 1, 2, 4, 8
+BITS = (UP, LEFT, DOWN, RIGHT)
+
+
+def direction_between(start, end):
+    """Índice de dirección (0-3) para ir de start a una celda adyacente end."""
+    offset = (end[0] - start[0], end[1] - start[1])
+    if offset not in OFFSETS:
+        raise ValueError(f"{end} no es adyacente a {start}")
+    return OFFSETS.index(offset)
+
+
+# Tablero compacto: toda la información de las celdas en arreglos de NumPy
+class Board():
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.walls = np.zeros((height, width), dtype=np.uint8)  # máscara de paredes (UP | LEFT | DOWN | RIGHT)
+        self.wall_health = np.zeros((4, height, width), dtype=np.int8)  # un plano por dirección
+        self.doors = np.zeros((height, width), dtype=np.uint8)  # máscara de puertas hacia cada vecino
+        self.fire = np.zeros((height, width), dtype=np.int8)  # 1 humo, 2 fuego
+        self.poi = np.zeros((height, width), dtype=np.int8)  # 1 falsa alarma, 2 víctima
+        self.entrance = np.zeros((height, width), dtype=bool)
+        self.inside_agents = np.zeros((height, width), dtype=np.int16)
+        self._cells = None
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Construye el tablero a partir de una matriz de objetos Cell (o vistas)."""
+        board = cls(len(cells), len(cells[0]))
+        for row in cells:
+            for cell in row:
+                x, y = cell.pos
+                mask = 0
+                for i, direction in enumerate(DIRECTIONS):
+                    if getattr(cell, direction):
+                        mask |= BITS[i]
+                    board.wall_health[i, x, y] = cell.wall_health[i]
+                board.walls[x, y] = mask
+                for door_pos in cell.door:
+                    board.doors[x, y] |= BITS[direction_between(cell.pos, door_pos)]
+                board.fire[x, y] = cell.fire
+                board.poi[x, y] = cell.poi
+                board.entrance[x, y] = cell.entrance
+                board.inside_agents[x, y] = cell.inside_agents
+        return board
+
+    def copy(self):
+        """Copia independiente del tablero (solo copia los arreglos)."""
+        board = Board(self.height, self.width)
+        for name in ("walls", "wall_health", "doors", "fire", "poi", "entrance", "inside_agents"):
+            setattr(board, name, getattr(self, name).copy())
+        return board
+
+    def __getstate__(self):
+        # Las vistas se reconstruyen al pedirlas; no se guardan al serializar
+        state = self.__dict__.copy()
+        state["_cells"] = None
+        return state
+
+    @property
+    def cells(self):
+        """Matriz de vistas compatibles con Cell; cada posición tiene siempre la misma vista."""
+        if self._cells is None:
+            self._cells = [[CellView(self, x, y) for y in range(self.width)] for x in range(self.height)]
+        return self._cells
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ("walls", "wall_health", "doors", "fire", "poi", "entrance", "inside_agents"))
+
+
+# Vista de una celda del tablero con la misma interfaz que Cell
+class CellView():
+    def __init__(self, board, x, y):
+        self.board = board
+        self.pos = (x, y)
+        self.door = DoorView(board, x, y)
+
+    def _get_wall(self, bit):
+        return bool(self.board.walls[self.pos] & bit)
+
+    def _set_wall(self, bit, value):
+        if value:
+            self.board.walls[self.pos] |= bit
+        else:
+            self.board.walls[self.pos] &= ~bit & 0xFF
+
+    up = property(lambda self: self._get_wall(UP), lambda self, value: self._set_wall(UP, value))
+    left = property(lambda self: self._get_wall(LEFT), lambda self, value: self._set_wall(LEFT, value))
+    down = property(lambda self: self._get_wall(DOWN), lambda self, value: self._set_wall(DOWN, value))
+    right = property(lambda self: self._get_wall(RIGHT), lambda self, value: self._set_wall(RIGHT, value))
+
+    @property
+    def wall_health(self):
+        # Vista de NumPy: wall_health[i] -= 1 escribe directo en el tablero
+        return self.board.wall_health[:, self.pos[0], self.pos[1]]
+
+    @property
+    def fire(self):
+        return int(self.board.fire[self.pos])
+
+    @fire.setter
+    def fire(self, value):
+        self.board.fire[self.pos] = value
+
+    @property
+    def poi(self):
+        return int(self.board.poi[self.pos])
+
+    @poi.setter
+    def poi(self, value):
+        self.board.poi[self.pos] = value
+
+    @property
+    def entrance(self):
+        return bool(self.board.entrance[self.pos])
+
+    @entrance.setter
+    def entrance(self, value):
+        self.board.entrance[self.pos] = value
+
+    @property
+    def inside_agents(self):
+        return int(self.board.inside_agents[self.pos])
+
+    @inside_agents.setter
+    def inside_agents(self, value):
+        self.board.inside_agents[self.pos] = value
+
+
+# Vista tipo lista de las puertas de una celda (posiciones de las celdas conectadas)
+class DoorView():
+    def __init__(self, board, x, y):
+        self.board = board
+        self.pos = (x, y)
+
+    def __iter__(self):
+        mask = self.board.doors[self.pos]
+        return iter([(self.pos[0] + dx, self.pos[1] + dy) for i, (dx, dy) in enumerate(OFFSETS) if mask & BITS[i]])
+
+    def __len__(self):
+        return bin(int(self.board.doors[self.pos])).count("1")
+
+    def __contains__(self, pos):
+        offset = (pos[0] - self.pos[0], pos[1] - self.pos[1])
+        return offset in OFFSETS and bool(self.board.doors[self.pos] & BITS[OFFSETS.index(offset)])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, pos):
+        self.board.doors[self.pos] |= BITS[direction_between(self.pos, pos)]
+
+    def remove(self, pos):
+        if pos not in self:
+            raise ValueError(f"{pos} no está en las puertas de {self.pos}")
+        self.board.doors[self.pos] &= ~BITS[direction_between(self.pos, pos)] & 0xFF
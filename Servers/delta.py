@@ -0,0 +1,209 @@
+# Formato delta de map_data: un keyframe completo cada keyframe_interval pasos y, entre ellos, solo los cambios.
+# El esquema que consume Unity (StepData.cs) está documentado en DELTA_FORMAT.md
+from board import DIRECTIONS
+from trajectory import CHANNELS, build_map_data
+
+FORMAT_VERSION = 1
+
+# Estado de cada celda en el campo "cells" de los deltas
+EMPTY, SMOKE, FIRE = 0, 1, 2
+
+# Canales con el estado del tablero; agentes, fuego, humo y puertas son conjuntos y se guardan ordenados
+STATE_CHANNELS = ("agents", "fire", "smoke", "pois", "open_doors")
+
+
+# Filas compactas de cada canal
+def _agent_row(agent):
+    row = [agent["agent_id"], agent["position"][0], agent["position"][1], agent["lleva_puffle"]]
+    if agent["target"] is not None:
+        row += agent["target"]
+    return row
+
+def _agent_dict(row):
+    return {
+        "agent_id": row[0],
+        "position": [row[1], row[2]],
+        "lleva_puffle": row[3],
+        "target": [row[4], row[5]] if len(row) > 4 else None
+    }
+
+def _poi_row(poi):
+    return [poi["position"][0], poi["position"][1], 2 if poi["type"] == "victim" else 1]
+
+def _poi_dict(row):
+    return {"position": [row[0], row[1]], "type": "victim" if row[2] == 2 else "false_alarm"}
+
+def _door_row(door):
+    return [door[0][0], door[0][1], door[1][0], door[1][1]]
+
+def _door_pair(row):
+    return [[row[0], row[1]], [row[2], row[3]]]
+
+def _destroyed_door_row(door):
+    return [door["cell1"][0], door["cell1"][1], door["cell2"][0], door["cell2"][1], DIRECTIONS.index(door["direction"])]
+
+def _destroyed_door_dict(row):
+    return {"cell1": [row[0], row[1]], "cell2": [row[2], row[3]], "direction": DIRECTIONS[row[4]]}
+
+def _destroyed_wall_row(wall):
+    return [wall["cell"][0], wall["cell"][1], wall["neighbor"][0], wall["neighbor"][1], DIRECTIONS.index(wall["direction"])]
+
+def _destroyed_wall_dict(row):
+    return {"cell": [row[0], row[1]], "neighbor": [row[2], row[3]], "direction": DIRECTIONS[row[4]]}
+
+
+# Estado completo de un paso con filas compactas (lo que se guarda en un keyframe)
+def _snapshot(record):
+    return {
+        "agents": sorted(_agent_row(agent) for agent in record["agents"]),
+        "fire": sorted(list(cell["position"]) for cell in record["fire_expansion"]),
+        "smoke": sorted(list(cell["position"]) for cell in record["smoke_expansion"]),
+        "pois": [_poi_row(poi) for poi in record["pois"]],
+        "open_doors": sorted(_door_row(door) for door in record["open_doors"]),
+    }
+
+# Eventos del paso (muertes, rescates y destrucciones); en los deltas solo se escriben los que no son cero
+def _events(record):
+    return {
+        "victims_dead": record["victims_dead"],
+        "agents_dead": record["agents_dead"],
+        "saved_lifes": record["saved_lifes"],
+        "destroyed_doors": [_destroyed_door_row(door) for door in record["destroyed_doors"]],
+        "destroyed_walls": [_destroyed_wall_row(wall) for wall in record["destroyed_walls"]],
+    }
+
+
+# Cambios de un paso respecto al anterior
+def _diff(previous, current):
+    frame = {}
+
+    # Agentes: solo los que cambiaron de posición, carga u objetivo
+    old_rows = {row[0]: row for row in previous["agents"]}
+    if sorted(old_rows) == [row[0] for row in current["agents"]]:
+        moved = [row for row in current["agents"] if old_rows[row[0]] != row]
+        if moved:
+            frame["moved"] = moved
+    else:
+        frame["agents"] = current["agents"]
+
+    # Fuego y humo: celdas que cambiaron de estado
+    old_state = {tuple(pos): SMOKE for pos in previous["smoke"]}
+    old_state.update((tuple(pos), FIRE) for pos in previous["fire"])
+    new_state = {tuple(pos): SMOKE for pos in current["smoke"]}
+    new_state.update((tuple(pos), FIRE) for pos in current["fire"])
+    cells = sorted([x, y, new_state.get((x, y), EMPTY)] for x, y in set(old_state) | set(new_state)
+                   if old_state.get((x, y), EMPTY) != new_state.get((x, y), EMPTY))
+    if cells:
+        frame["cells"] = cells
+
+    if previous["pois"] != current["pois"]:
+        frame["pois"] = current["pois"]
+
+    # Puertas: las que dejaron de estar abiertas y las nuevas
+    old_doors = set(map(tuple, previous["open_doors"]))
+    new_doors = set(map(tuple, current["open_doors"]))
+    if old_doors - new_doors:
+        frame["doors_closed"] = sorted(map(list, old_doors - new_doors))
+    if new_doors - old_doors:
+        frame["doors_opened"] = sorted(map(list, new_doors - old_doors))
+
+    return frame
+
+
+# Función que convierte los registros de cada paso (o map_data) al formato delta
+def encode_deltas(records, keyframe_interval=10):
+    if isinstance(keyframe_interval, bool) or not isinstance(keyframe_interval, int) or keyframe_interval < 1:
+        raise ValueError("keyframe_interval debe ser un entero mayor o igual que 1")
+    if isinstance(records, dict):
+        records = split_map_data(records)
+
+    frames = []
+    previous = None
+    damage = None
+    for record in records:
+        if record.get("type", "step") != "step":
+            continue
+        current = _snapshot(record)
+        events = _events(record)
+        if len(frames) % keyframe_interval == 0:
+            frame = dict(current, **events)
+            frame["key"] = True
+            frame["step"] = record["step"]
+            frame["damage"] = record["structural_damage_left"]
+        else:
+            frame = _diff(previous, current)
+            frame.update((channel, value) for channel, value in events.items() if value)
+            if record["structural_damage_left"] != damage:
+                frame["damage"] = record["structural_damage_left"]
+        damage = record["structural_damage_left"]
+
+        frames.append(frame)
+        previous = current
+
+    return {"format": "delta", "version": FORMAT_VERSION, "keyframe_interval": keyframe_interval,
+            "steps": len(frames), "frames": frames}
+
+
+# Función que separa map_data en los registros de cada paso
+def split_map_data(map_data):
+    return [dict({"type": "step", "step": map_data["agents"][i]["step"]},
+                 **{channel: map_data[channel][i][field] for channel, field in CHANNELS.items()})
+            for i in range(len(map_data["agents"]))]
+
+
+# Función que reconstruye los registros de cada paso a partir del formato delta
+# Agentes, fuego, humo y puertas abiertas salen ordenados (agentes por agent_id, celdas por posición)
+def iter_decoded(payload):
+    if payload.get("format") != "delta" or payload.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Formato de trayectoria no soportado: {payload.get('format')} v{payload.get('version')}")
+
+    state = None
+    step = damage = None
+    for frame in payload["frames"]:
+        if frame.get("key"):
+            state = {channel: list(frame[channel]) for channel in STATE_CHANNELS}
+            step = frame["step"]
+        else:
+            step += 1
+            for channel in STATE_CHANNELS:
+                if channel in frame:
+                    state[channel] = list(frame[channel])
+
+            if "moved" in frame:
+                rows = {row[0]: row for row in state["agents"]}
+                rows.update((row[0], row) for row in frame["moved"])
+                state["agents"] = [rows[agent_id] for agent_id in sorted(rows)]
+
+            if "cells" in frame:
+                changed = {(x, y): cell_state for x, y, cell_state in frame["cells"]}
+                for channel, cell_state in (("fire", FIRE), ("smoke", SMOKE)):
+                    cells = [pos for pos in state[channel] if tuple(pos) not in changed]
+                    cells += [[x, y] for (x, y), new_state in changed.items() if new_state == cell_state]
+                    state[channel] = sorted(cells)
+
+            closed = set(map(tuple, frame.get("doors_closed", [])))
+            if closed or "doors_opened" in frame:
+                doors = [door for door in state["open_doors"] if tuple(door) not in closed]
+                state["open_doors"] = sorted(doors + frame.get("doors_opened", []))
+        damage = frame.get("damage", damage)
+
+        yield {
+            "type": "step",
+            "step": step,
+            "agents": [_agent_dict(row) for row in state["agents"]],
+            "fire_expansion": [{"position": list(pos), "state": "fire"} for pos in state["fire"]],
+            "smoke_expansion": [{"position": list(pos), "state": "smoke"} for pos in state["smoke"]],
+            "pois": [_poi_dict(row) for row in state["pois"]],
+            "victims_dead": frame.get("victims_dead", 0),
+            "agents_dead": frame.get("agents_dead", 0),
+            "saved_lifes": frame.get("saved_lifes", 0),
+            "structural_damage_left": damage,
+            "destroyed_doors": [_destroyed_door_dict(row) for row in frame.get("destroyed_doors", [])],
+            "destroyed_walls": [_destroyed_wall_dict(row) for row in frame.get("destroyed_walls", [])],
+            "open_doors": [_door_pair(row) for row in state["open_doors"]],
+        }
+
+
+# Función que reconstruye map_data a partir del formato delta
+def decode_deltas(payload):
+    return build_map_data(iter_decoded(payload))
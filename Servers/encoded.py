@@ -0,0 +1,73 @@
+# Respuestas JSON serializadas una sola vez, con sus variantes comprimidas listas para servir
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from flask import Response
+
+# brotli es opcional: sin él solo se ofrecen gzip e identity
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = 512  # cuerpos más chicos no se comprimen
+
+
+# Cuerpo de una respuesta ya codificado: los bytes de cada codificación y su ETag se calculan al crearlo
+class EncodedBody():
+    def __init__(self, data, last_modified=None):
+        identity = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self.variants = {"identity": identity}
+        if len(identity) >= COMPRESS_MIN_SIZE:
+            self.variants["gzip"] = gzip.compress(identity, compresslevel=9)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(identity, quality=11)
+        self.etags = {encoding: hashlib.md5(body).hexdigest() for encoding, body in self.variants.items()}
+        self.last_modified = last_modified
+
+    @property
+    def nbytes(self):
+        return sum(len(body) for body in self.variants.values())
+
+    def negotiate(self, request):
+        """Codificación que se manda según Accept-Encoding (la más chica entre las que acepta el cliente)."""
+        accepted = [encoding for encoding in self.variants
+                    if encoding == "identity" or request.accept_encodings[encoding] > 0]
+        return min(accepted, key=lambda encoding: len(self.variants[encoding]))
+
+    def response(self, request, status=200):
+        encoding = self.negotiate(request)
+        response = Response(self.variants[encoding], status=status, mimetype="application/json")
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.set_etag(self.etags[encoding])  # cada codificación tiene su propio ETag
+        if self.last_modified is not None:
+            response.last_modified = self.last_modified
+        response.cache_control.no_cache = True  # el cliente puede guardarla pero revalida con If-None-Match
+        return response.make_conditional(request)
+
+
+# Respuestas codificadas por llave, las menos usadas se descartan primero
+class EncodedCache():
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, build):
+        """Regresa el EncodedBody de key; si no está guardado lo crea con build()."""
+        with self.lock:
+            body = self.entries.get(key)
+            if body is not None:
+                self.entries.move_to_end(key)
+                return body
+        body = build()
+        with self.lock:
+            self.entries[key] = body
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return body
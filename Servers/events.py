@@ -0,0 +1,74 @@
+# Librerías
+import sys
+
+# Niveles de los eventos: SILENT no imprime nada, INFO los eventos del juego, DEBUG además el estado de cada paso
+# TRACE nunca se imprime: solo llega a los suscriptores que lo pidan (cambios de celda, muchos por paso)
+SILENT = 0
+INFO = 1
+DEBUG = 2
+TRACE = 3
+
+# Texto con el que se imprime cada tipo de evento
+MESSAGES = {
+    "status": "Vidas salvadas: {saved_lifes}, Muertes: {dead_lifes}, Daño Estructural Restante: {structural_damage_left}, Agentes muertos: {dead_agents}",
+    "snow_hill": "Snowfall en: {pos}, snow hill generado",
+    "snow_mountain": "Snowfall en: {pos}, snow mountain generado",
+    "avalanche": "Snowfall en: {pos}, avalanche generada",
+    "wall_damaged_agent": "Pared en {pos} dañada por agente",
+    "wall_destroyed_agent": "Pared removida por agente en {pos}",
+    "wall_damaged_avalanche": "Pared en {pos} dañada por primera vez por avalancha",
+    "wall_destroyed_avalanche": "Pared removida por avalancha en {pos}",
+    "wall_removed": "Pared removida entre {start} y {end} en dirección {direction}",
+    "door_removed": "Puerta removida por explosión en {cell1} y {cell2} en dirección {direction}",
+    "agent_died_rescuing": "Agente {agent_id} quemado mientras rescataba en {pos}",
+    "agent_died": "Agente {agent_id} ha muerto quemado en {pos}",
+    "victim_lost": "Puffle revelado y perdido en {pos} por chispa",
+    "false_alarm_burned": "Falsa alarma revelada en {pos} por fuego",
+    "defeat_damage": "Derrota: Demasiado daño a la cueva",
+    "defeat_deaths": "Derrota: Demasiadas perdidas",
+    "victory": "Victoria: Puffles rescatados",
+    "poi": "Puntos de interés en: {pos}",
+    "fire": "Fuego en: {pos}",
+    "smoke": "Humo en: {pos}",
+    "agent": "Agente: {agent_id} Posición: {pos} Yendo a: {target}",
+    "step_summary": "Paso {step}: Fuegos = {fires}, Humos = {smokes}, POIs = {pois}, Muertes de Víctimas = {victims_dead}, Muertes de Agentes = {agents_dead}, Vidas Salvadas = {saved_lifes}, Daño Estructural Restante = {structural_damage_left}",
+    "step_poi": "POI en: {pos} - Tipo: {poi_type}",
+    "section_end": "\n",
+    "run_result": "Resultado de la simulación {run}: {resultado}",
+    "batch_summary": "Total de simulaciones ejecutadas: {runs}\nVictorias: {victorias}\nDerrotas: {derrotas}",
+}
+
+
+# Registro de eventos de la simulación: imprime los que pasen el nivel y los entrega a los suscriptores
+class EventLog():
+    def __init__(self, level=DEBUG, stream=None):
+        self.level = level
+        self.stream = stream  # None usa sys.stdout al momento de imprimir
+        self.listeners = []
+        self._update_max_level()
+
+    def _update_max_level(self):
+        self.max_level = max([self.level] + [level for _, level in self.listeners])
+
+    def enabled(self, level):
+        """Indica si algún evento de este nivel se imprime o llega a un suscriptor."""
+        return level <= self.max_level
+
+    def subscribe(self, callback, level=DEBUG):
+        """callback(kind, data) recibe los eventos hasta level, sin formatear; con TRACE también los de solo suscriptores."""
+        self.listeners.append((callback, level))
+        self._update_max_level()
+
+    def unsubscribe(self, callback):
+        self.listeners = [(listener, level) for listener, level in self.listeners if listener is not callback]
+        self._update_max_level()
+
+    def emit(self, level, kind, **data):
+        # Si nadie escucha este nivel no se formatea ningún texto
+        if level > self.max_level:
+            return
+        for callback, listener_level in self.listeners:
+            if level <= listener_level:
+                callback(kind, data)
+        if level <= min(self.level, DEBUG):
+            print(MESSAGES[kind].format(**data), file=self.stream or sys.stdout)
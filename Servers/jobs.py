@@ -0,0 +1,152 @@
+# Servicio de corridas: recibe trabajos "correr (seed, num_agents, map)" y los ejecuta en un pool de procesos,
+# así el paso a paso del modelo (CPU) no bloquea a los hilos que atienden las peticiones HTTP
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import Pool
+
+from events import SILENT
+from model import MapModel
+from run_cache import run_key
+from runner import run_simulation, summarize
+
+# Los mapas se buscan junto a este archivo (solo por nombre, nunca rutas arbitrarias)
+MAPS_DIR = os.path.dirname(os.path.abspath(__file__))
+MAX_PENDING = 256  # trabajos en cola o corriendo; más que esto se rechaza
+MAX_FINISHED = 256  # trabajos terminados que se conservan; se olvidan los más viejos
+MAX_AGENTS = 64  # agentes por corrida; más que esto se rechaza para que una petición no ocupe un proceso sin límite
+
+
+# Función que resuelve el nombre de un mapa a su ruta; ValueError si no existe
+def resolve_map(name):
+    if not isinstance(name, str) or os.path.basename(name) != name or not name.endswith('.txt'):
+        raise ValueError(f"Nombre de mapa inválido: {name}")
+    path = os.path.join(MAPS_DIR, name)
+    if not os.path.isfile(path):
+        raise ValueError(f"No existe el mapa: {name}")
+    return path
+
+
+# Función que ejecuta cada proceso del pool: corre una simulación completa y regresa su resumen y map_data
+def run_job(num_agents, seed, map_path):
+    model = MapModel(num_agents, seed=seed, log_level=SILENT, map_path=map_path)
+    map_data = run_simulation(model)
+    return {"summary": summarize(model), "map_data": map_data}
+
+
+# Un trabajo y su estado: pending (en cola o corriendo), done o failed
+class Job():
+    def __init__(self, job_id, num_agents, seed, map_name):
+        self.id = job_id
+        self.num_agents = num_agents
+        self.seed = seed
+        self.map = map_name
+        self.status = "pending"
+        self.cached = False  # True si el resultado salió de la caché sin simular
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "num_agents": self.num_agents,
+            "seed": self.seed,
+            "map": self.map,
+            "status": self.status,
+            "cached": self.cached,
+            "error": self.error,
+            "submitted": self.submitted,
+            "finished": self.finished,
+            "summary": self.result["summary"] if self.result else None,
+        }
+
+
+# Cola de trabajos sobre un Pool de procesos; es segura para llamarse desde varios hilos
+# cache (run_cache.RunCache): una corrida con semilla ya guardada se responde sin mandarla al pool
+class JobService():
+    def __init__(self, workers=None, max_pending=MAX_PENDING, max_finished=MAX_FINISHED, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.pool = Pool(self.workers)
+        self.jobs = OrderedDict()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(self, num_agents=6, seed=None, map_name='final.txt'):
+        """Encola una corrida y regresa su Job; None si ya hay max_pending en cola. ValueError si los datos no son válidos."""
+        # bool es subclase de int, pero true/false no son un número de agentes ni una semilla
+        if isinstance(num_agents, bool) or not isinstance(num_agents, int) or not 0 < num_agents <= MAX_AGENTS:
+            raise ValueError(f"num_agents debe ser un entero entre 1 y {MAX_AGENTS}")
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+            raise ValueError("seed debe ser un entero mayor o igual que 0")
+        map_path = resolve_map(map_name)
+
+        if self.cache is not None and seed is not None:
+            entry = self.cache.get(run_key(map_path, seed, num_agents), need_map_data=True)
+            if entry is not None:
+                with self.lock:
+                    job = Job(str(next(self._ids)), num_agents, seed, map_name)
+                    job.cached = True
+                    self.jobs[job.id] = job
+                    self.pending += 1
+                self._finish(job, entry, None)
+                return job
+
+        with self.lock:
+            if self.pending >= self.max_pending:
+                return None
+            job = Job(str(next(self._ids)), num_agents, seed, map_name)
+            self.jobs[job.id] = job
+            self.pending += 1
+
+        self.pool.apply_async(run_job, (num_agents, seed, map_path),
+                              callback=lambda result: self._store(job, map_path, result),
+                              error_callback=lambda error: self._finish(job, None, error))
+        return job
+
+    def _store(self, job, map_path, result):
+        if self.cache is not None:
+            try:
+                self.cache.put(run_key(map_path, result["summary"]["seed"], job.num_agents), result)
+            except OSError:
+                pass  # sin espacio o sin permisos: el trabajo termina igual, solo no queda en disco
+        self._finish(job, result, None)
+
+    def _finish(self, job, result, error):
+        # Corre en el hilo de resultados del Pool (o en submit si el resultado salió de la caché)
+        with self.lock:
+            job.result = result
+            job.error = f"{type(error).__name__}: {error}" if error is not None else None
+            job.status = "done" if error is None else "failed"
+            job.finished = time.time()
+            self.pending -= 1
+            finished = [old for old in self.jobs.values() if old.status != "pending"]
+            for old in finished[:max(0, len(finished) - self.max_finished)]:
+                del self.jobs[old.id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def remove(self, job_id):
+        """Olvida un trabajo terminado; los que siguen en cola no se pueden cancelar."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job.status != "pending":
+                del self.jobs[job_id]
+            return job
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.jobs.values()))
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
@@ -0,0 +1,184 @@
+# Lectura de mapas (final.txt) en una sola pasada y con validación
+#
+# Formato, una entrada por línea y en este orden (las posiciones son "fila columna", empezando en 1):
+#   paredes      una fila del interior por línea, un código de 4 dígitos por celda (arriba, izq, abajo, derecha)
+#   alertas      "x y v" (víctima) o "x y f" (falsa alarma)
+#   fuegos       "x y"
+#   puertas      "x1 y1 x2 y2" (dos celdas vecinas)
+#   salidas      "x y" (celdas en el borde del interior)
+# Sin encabezados la sección de cada línea sale de su forma. Fuegos y salidas tienen la misma forma y solo las separan
+# las puertas, así que un mapa sin puertas debe marcar sus secciones con una línea con el nombre de la sección
+# (walls, alerts, fires, doors o exits); después de un encabezado cada línea debe ser de esa sección.
+# El tamaño del tablero y la cantidad de cada cosa salen del archivo; alrededor del interior se agrega
+# un anillo de celdas exteriores
+import os
+
+SECTIONS = ("walls", "alerts", "fires", "doors", "exits")
+
+_maps = {}
+
+
+# Error de formato de un mapa; indica la línea del problema
+class MapFormatError(ValueError):
+    def __init__(self, message, line=None, source=None):
+        self.line = line
+        self.source = source
+        where = f"{source or 'mapa'}, línea {line}: " if line is not None else f"{source or 'mapa'}: "
+        super().__init__(where + message)
+
+
+# Mapa ya leído; no se modifica, así que lo pueden compartir muchos modelos
+class GameMap():
+    def __init__(self, walls, alerts, fires, doors, exits):
+        self.walls = tuple(tuple(row) for row in walls)  # códigos del interior por fila
+        self.alerts = tuple(alerts)  # ((x, y), tipo) con tipo 2 víctima, 1 falsa alarma
+        self.fires = tuple(fires)
+        self.doors = tuple(doors)  # ((x1, y1), (x2, y2))
+        self.exits = tuple(exits)
+
+    @property
+    def inner_height(self):
+        return len(self.walls)
+
+    @property
+    def inner_width(self):
+        return len(self.walls[0])
+
+    @property
+    def height(self):
+        """Filas del tablero completo (interior más el anillo exterior)."""
+        return self.inner_height + 2
+
+    @property
+    def width(self):
+        return self.inner_width + 2
+
+    def inside(self, pos):
+        return 1 <= pos[0] <= self.inner_height and 1 <= pos[1] <= self.inner_width
+
+    def outside_positions(self):
+        """Celdas exteriores en el orden en que se reparten los agentes: arriba, costados fila por fila, abajo."""
+        positions = [(0, y) for y in range(self.width)]
+        for x in range(1, self.height - 1):
+            positions += [(x, 0), (x, self.width - 1)]
+        return positions + [(self.height - 1, y) for y in range(self.width)]
+
+    def outside_wall(self, pos):
+        """Código de paredes de una celda exterior: la pared que da hacia el interior."""
+        x, y = pos
+        if (x in (0, self.height - 1)) and (y in (0, self.width - 1)):
+            return "0000"
+        if x == 0:
+            return "0010"
+        if x == self.height - 1:
+            return "1000"
+        return "0001" if y == 0 else "0100"
+
+
+def _numbers(tokens, line, source):
+    try:
+        return [int(token) for token in tokens]
+    except ValueError:
+        raise MapFormatError(f"se esperaban números y se leyó {' '.join(tokens)!r}", line, source) from None
+
+
+# Función que lee un mapa de una ruta o de un archivo ya abierto (cualquier iterable de líneas)
+def parse_map(source):
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'r') as map_file:
+            return parse_map_lines(map_file, os.fspath(source))
+    return parse_map_lines(source, getattr(source, 'name', None))
+
+
+def parse_map_lines(lines, source=None):
+    walls, alerts, fires, doors, exits = [], [], [], [], []
+    section = 0
+    headed = False  # después del primer encabezado ya no se adivina la sección
+    for number, line in enumerate(lines, 1):
+        tokens = line.split()
+        if not tokens:
+            continue
+
+        if len(tokens) == 1 and tokens[0].lower() in SECTIONS:
+            new_section = SECTIONS.index(tokens[0].lower())
+            if new_section < section or (headed and new_section == section):
+                raise MapFormatError(f"sección {tokens[0]!r} fuera de orden (el orden es {', '.join(SECTIONS)})", number, source)
+            section = new_section
+            headed = True
+            continue
+
+        # Sin encabezados la forma de la línea dice a qué sección pertenece; las secciones solo avanzan
+        if headed:
+            kind = section
+        elif section == 0 and (not walls or len(tokens[0]) == 4):
+            kind = 0
+        elif len(tokens) == 3 and section <= 1:
+            kind = 1
+        elif len(tokens) == 2 and section <= 2:
+            kind = 2
+        elif len(tokens) == 4 and section <= 3:
+            kind = 3
+        elif len(tokens) == 2 and section >= 3:
+            kind = 4
+        else:
+            kind = None
+        if kind is None or (kind > 0 and len(tokens) != (None, 3, 2, 4, 2)[kind]):
+            expected = SECTIONS[section] if headed else f"{SECTIONS[section]} o la sección siguiente"
+            raise MapFormatError(f"línea inesperada {line.strip()!r} (se esperaba {expected})", number, source)
+        section = kind
+
+        if kind == 0:
+            for token in tokens:
+                if len(token) != 4 or not set(token) <= {"0", "1"}:
+                    raise MapFormatError(f"código de pared inválido {token!r} (4 dígitos 0/1: arriba, izq, abajo, derecha)", number, source)
+            if walls and len(tokens) != len(walls[0]):
+                raise MapFormatError(f"la fila de paredes tiene {len(tokens)} celdas y la primera {len(walls[0])}", number, source)
+            walls.append(tokens)
+        elif kind == 1:
+            x, y = _numbers(tokens[:2], number, source)
+            if tokens[2] not in ("v", "f"):
+                raise MapFormatError(f"tipo de alerta desconocido {tokens[2]!r} (usa v o f)", number, source)
+            alerts.append(((x, y), 2 if tokens[2] == "v" else 1, number))
+        elif kind == 2:
+            fires.append((tuple(_numbers(tokens, number, source)), number))
+        elif kind == 3:
+            x1, y1, x2, y2 = _numbers(tokens, number, source)
+            doors.append((((x1, y1), (x2, y2)), number))
+        else:
+            exits.append((tuple(_numbers(tokens, number, source)), number))
+
+    if fires and not doors and not headed:
+        raise MapFormatError("sin puertas no se distinguen los fuegos de las salidas; marca las secciones con encabezados (fires, exits)",
+                             fires[0][1], source)
+    if not walls:
+        raise MapFormatError("el mapa no tiene paredes", source=source)
+
+    game_map = GameMap(walls, [(pos, kind) for pos, kind, _ in alerts], [pos for pos, _ in fires],
+                       [door for door, _ in doors], [pos for pos, _ in exits])
+
+    # Validar posiciones
+    for pos, _, number in alerts:
+        if not game_map.inside(pos):
+            raise MapFormatError(f"alerta fuera del interior: {pos}", number, source)
+    for pos, number in fires:
+        if not game_map.inside(pos):
+            raise MapFormatError(f"fuego fuera del interior: {pos}", number, source)
+    for (start, end), number in doors:
+        if not (game_map.inside(start) and game_map.inside(end)):
+            raise MapFormatError(f"puerta fuera del interior: {start} - {end}", number, source)
+        if abs(start[0] - end[0]) + abs(start[1] - end[1]) != 1:
+            raise MapFormatError(f"la puerta une celdas que no son vecinas: {start} - {end}", number, source)
+    for pos, number in exits:
+        x, y = pos
+        if not game_map.inside(pos) or not (x in (1, game_map.inner_height) or y in (1, game_map.inner_width)):
+            raise MapFormatError(f"la salida {pos} no está en el borde del interior", number, source)
+    return game_map
+
+
+# Función que lee un mapa una sola vez por archivo; se vuelve a leer si el archivo cambia
+def load_map(map_path='final.txt'):
+    stat = os.stat(map_path)
+    cache_key = (os.path.abspath(map_path), stat.st_mtime_ns, stat.st_size)
+    if cache_key not in _maps:
+        _maps[cache_key] = parse_map(map_path)
+    return _maps[cache_key]
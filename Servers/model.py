@@ -0,0 +1,650 @@
+# Librerías
+from mesa import Model
+from mesa.space import MultiGrid
+from mesa.time import RandomActivation
+
+import numpy as np
+import heapq
+import random
+
+from agent import PenguinAgent
+from assignment import hungarian
+from board import Board
+from events import DEBUG, INFO, TRACE, EventLog
+from maps import load_map
+from pathfinding import INF, EdgeCosts, PathEngine
+from registry import CellSet
+
+# Versión de las reglas de la simulación: subirla cuando un cambio altere las corridas (invalida run_cache)
+RULES_VERSION = 3
+
+# Políticas para repartir objetivos entre los agentes (MapModel.assignment)
+ASSIGNMENTS = ("optimal", "greedy")
+MAX_ASSIGN_STEPS = 100  # objetivos a esta distancia o más no se asignan
+
+_templates = {}
+
+# Clase Cell que nos ayuda a guardar información
+class Cell():
+    def __init__(self, x, y, wall):
+        self.pos = (x, y)
+        self.wall_health = [0, 0, 0, 0]
+        #lectura de muros del txt 0100 (arriba,izq,abajo,derecha)
+        #pared arriba
+        if wall[0] == '1':
+            self.up = True
+            self.wall_health[0] = 2
+        else:
+            self.up = False
+        #pared izq
+        if wall[1] == '1':
+            self.left = True
+            self.wall_health[1] = 2
+        else:
+            self.left = False
+        #pared abajo
+        if wall[2] == '1':
+            self.down = True
+            self.wall_health[2] = 2
+        else:
+            self.down = False
+        #pared derecha
+        if wall[3] == '1':
+            self.right = True
+            self.wall_health[3] = 2
+        else:
+            self.right = False
+
+        self.poi = 0 #usa 1 si es falsa alarma, 2 si es una víctima
+        self.fire = 0 # 1 si es humo, 2 si es fuego
+
+        # Arreglo con la posición de la casilla donde se conecta con puerta
+        self.door = []
+
+        self.entrance = False #es una entrada?
+
+        self.inside_agents = 0 #num de agentes en la celda
+
+    # Copia independiente de la celda (las listas de paredes y puertas no se comparten)
+    def copy(self):
+        cell = Cell.__new__(Cell)
+        cell.__dict__.update(self.__dict__)
+        cell.wall_health = self.wall_health.copy()
+        cell.door = self.door.copy()
+        return cell
+
+# Plantilla de un mapa: las celdas iniciales se arman una sola vez y cada modelo recibe una copia con instantiate()
+# No se modifica, así que se puede compartir entre modelos y mandar a otros procesos
+class MapTemplate():
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.height = game_map.height
+        self.width = game_map.width
+        self.cells, outside = self.read_map_data()
+        self.put_entrance_doors()
+        self.outside_positions = [cell.pos for cell in outside]
+        self.inside_positions = [cell.pos for row in self.cells for cell in row if cell not in outside]
+        self.board = Board.from_cells(self.cells)
+
+    # Esta función crea las celdas del mapa (game_map) y las coloca en una matriz y un arreglo (cells y outside)
+    def read_map_data(self):
+        game_map = self.game_map
+        map_grid = [[None for _ in range(self.width)] for _ in range(self.height)]
+
+        for i, row in enumerate(game_map.walls):
+            for j, cell_walls in enumerate(row):
+                map_grid[i + 1][j + 1] = Cell(i + 1, j + 1, cell_walls)
+
+        for (x, y), poi in game_map.alerts:
+            map_grid[x][y].poi = poi
+
+        for x, y in game_map.fires:
+            map_grid[x][y].fire = 2
+
+        for start, end in game_map.doors:
+            map_grid[start[0]][start[1]].door.append(end)
+            map_grid[end[0]][end[1]].door.append(start)
+
+        for x, y in game_map.exits:
+            map_grid[x][y].entrance = True
+
+        # Agregar celdas exteriores
+        outside = []
+        for x, y in game_map.outside_positions():
+            cell = Cell(x, y, game_map.outside_wall((x, y)))
+            map_grid[x][y] = cell
+            outside.append(cell)
+        return map_grid, outside
+
+    # Esta función indica las puertas de entrada en la matriz cells
+    def put_entrance_doors(self):
+        for row in self.cells:
+            for cell in row:
+                if cell.entrance:
+                    if cell.pos[0] == 1:
+                        cell.up = False
+                        self.cells[cell.pos[0] - 1][cell.pos[1]].down = False
+                    elif cell.pos[0] == self.height - 2:
+                        cell.down = False
+                        self.cells[cell.pos[0] + 1][cell.pos[1]].up = False
+                    elif cell.pos[1] == 1:
+                        cell.left = False
+                        self.cells[cell.pos[0]][cell.pos[1] - 1].right = False
+                    elif cell.pos[1] == self.width - 2:
+                        cell.right = False
+                        self.cells[cell.pos[0]][cell.pos[1] + 1].left = False
+
+    def instantiate(self, compact_board=False):
+        """Estado nuevo del tablero: (cells, outside, inside, board); board es None si no se pidió el tablero compacto."""
+        if compact_board:
+            board = self.board.copy()
+            cells = board.cells
+        else:
+            board = None
+            cells = [[cell.copy() for cell in row] for row in self.cells]
+        outside = [cells[x][y] for x, y in self.outside_positions]
+        inside = [cells[x][y] for x, y in self.inside_positions]
+        return cells, outside, inside, board
+
+# Función que regresa la plantilla de un mapa; se reutiliza mientras el archivo no cambie
+def load_template(map_path='final.txt'):
+    game_map = load_map(map_path)
+    if game_map not in _templates:
+        _templates[game_map] = MapTemplate(game_map)
+    return _templates[game_map]
+
+# Clase Model
+class MapModel(Model):
+    # template (MapTemplate) permite crear muchos modelos del mismo mapa sin volver a leerlo; si no se da se usa el de map_path
+    # assignment: "optimal" (algoritmo húngaro) o "greedy" (la política voraz original)
+    def __init__(self, num_agents, compact_board=False, seed=None, log_level=DEBUG, map_path='final.txt', template=None, assignment="optimal"):
+        super().__init__()
+        if assignment not in ASSIGNMENTS:
+            raise ValueError(f"Política de asignación desconocida: {assignment} (usa {' o '.join(ASSIGNMENTS)})")
+        self.assignment = assignment
+
+        # Registro de eventos; con log_level=SILENT no se formatea ni imprime nada
+        self.log = EventLog(log_level)
+
+        # Semilla de la corrida y flujos aleatorios independientes por subsistema:
+        # aparición de agentes, nevadas, nuevos puntos de interés y orden de activación (self.random, que usa RandomActivation)
+        self.seed = seed if seed is not None else self.random.getrandbits(32)
+        spawn, snowfall, poi, activation = np.random.SeedSequence(self.seed).spawn(4)
+        self.spawn_random = random.Random(int(spawn.generate_state(1)[0]))
+        self.snowfall_random = random.Random(int(snowfall.generate_state(1)[0]))
+        self.poi_random = random.Random(int(poi.generate_state(1)[0]))
+        self.random = random.Random(int(activation.generate_state(1)[0]))
+
+        self.steps = 0
+        self.smokes = CellSet()
+        self.saved_lifes = 0
+        self.dead_lifes = 0
+        self.dead_agents = 0
+        self.map_path = map_path
+        self.template = template if template is not None else load_template(map_path)
+        self.game_map = self.template.game_map
+        self.width = self.template.width
+        self.height = self.template.height
+        self.structural_damage_left = 24
+        self.num_agents = num_agents
+        self.grid = MultiGrid(self.height, self.width, False)
+
+        # Costos para planear rutas y caché de campos de distancia por versión del tablero
+        self.move_cost = 1
+        self.door_cost = 1
+        self.wall_cost = 4.1
+        self.fire_cost = 1
+        self.board_version = 0
+        self.board_changes = []
+        self.distance_fields = {}
+        self.path_engine = PathEngine(self.height, self.width)
+        # Con compact_board se usa el tablero compacto en NumPy; las vistas mantienen la interfaz de Cell
+        self.cells, outside, inside, self.board = self.template.instantiate(compact_board)
+        # Costos de las aristas para la búsqueda; se actualizan en remove_wall, remove_door y set_fire
+        self.edge_costs = EdgeCosts(self.height, self.width, self.wall_cost, self.door_cost, self.fire_cost)
+        self.edge_costs.build(self.cells)
+        # Colecciones de celdas con pertenencia en O(1) (registry.CellSet); inside en orden de filas es donde cae la nieve
+        self.outside = CellSet(outside)
+        self.inside = CellSet(inside)
+        self.interest_points = CellSet(cell for row in self.cells for cell in row if cell.poi != 0)
+        self.fire_points = CellSet(cell for row in self.cells for cell in row if cell.fire == 2)
+        self.schedule = RandomActivation(self)
+        self.running = True
+
+        # Inicializar listas para rastrear destrucciones
+        self.destroyed_doors = []
+        self.destroyed_walls = []
+
+        for i in range(self.num_agents):
+            agent = PenguinAgent(i, self)
+            self.schedule.add(agent)
+            self.grid.place_agent(agent, (0,0))
+            self.position_agent(agent)
+
+    # Esta función posiciona a los agentes en una celda aleatoria fuera de la casa
+    def position_agent(self, agent):
+        random_pos = self.spawn_random.choice(self.outside)
+        self.grid.move_agent(agent, random_pos.pos)
+
+    # Esta función indica en qué celda cae nieve y qué pasa de acuerdo al estado de la celda
+    def snowfall(self):
+        random_cell = self.snowfall_random.choice(self.inside)
+        if random_cell.fire == 0:
+            self.set_fire(random_cell, 1)
+            self.log.emit(INFO, "snow_hill", pos=random_cell.pos)
+        elif random_cell.fire == 1:
+            self.set_fire(random_cell, 2)
+            self.log.emit(INFO, "snow_mountain", pos=random_cell.pos)
+        elif random_cell.fire == 2:
+            for i in range(4):
+                self.avalanche_dir(i, random_cell)
+            self.log.emit(INFO, "avalanche", pos=random_cell.pos)
+
+    # Esta función modela el comportamiento de las avalanchas
+    def avalanche_dir(self, direction, cell):
+      """
+      Handles the propagation of an avalanche in a specified direction, affecting walls, doors, and propagating fire.
+      """
+      if cell not in self.inside:
+          return  # Do nothing if the cell is outside the structure.
+
+      # Mapping of directions with coordinate adjustments and wall attributes.
+      directions = {
+          0: {"neighbor_offset": (-1, 0), "wall_index": 0, "opposite_wall_index": 2, "wall_attr": "up", "opposite_wall_attr": "down"},
+          1: {"neighbor_offset": (0, -1), "wall_index": 1, "opposite_wall_index": 3, "wall_attr": "left", "opposite_wall_attr": "right"},
+          2: {"neighbor_offset": (1, 0), "wall_index": 2, "opposite_wall_index": 0, "wall_attr": "down", "opposite_wall_attr": "up"},
+          3: {"neighbor_offset": (0, 1), "wall_index": 3, "opposite_wall_index": 1, "wall_attr": "right", "opposite_wall_attr": "left"},
+      }
+
+      # Get the data for the direction.
+      dir_data = directions[direction]
+      neighbor_offset = dir_data["neighbor_offset"]
+      wall_index = dir_data["wall_index"]
+      opposite_wall_index = dir_data["opposite_wall_index"]
+      wall_attr = dir_data["wall_attr"]
+      opposite_wall_attr = dir_data["opposite_wall_attr"]
+
+      # Identify the neighboring cell.
+      neighbor_pos = (cell.pos[0] + neighbor_offset[0], cell.pos[1] + neighbor_offset[1])
+
+      # Check if neighbor position is within grid bounds
+      if 0 <= neighbor_pos[0] < self.height and 0 <= neighbor_pos[1] < self.width:
+          neighbor_cell = self.cells[neighbor_pos[0]][neighbor_pos[1]]
+
+          if cell.fire == 2:  # Case: The cell is on fire.
+              if neighbor_cell.pos in cell.door:
+                  self.remove_door(cell, neighbor_cell, direction)
+              elif getattr(cell, wall_attr):  # Case: There is a wall.
+                  # Reduce the health of the wall in both cells.
+                  cell.wall_health[wall_index] -= 1
+                  neighbor_cell.wall_health[opposite_wall_index] -= 1
+
+                  # Check if the wall was damaged for the first time.
+                  if cell.wall_health[wall_index] == 1:
+                      self.structural_damage_left -= 1  # Damage for the first time
+                      self.log.emit(INFO, "wall_damaged_avalanche", pos=cell.pos)
+                  # If the wall collapses, remove it and update the structural damage.
+                  elif cell.wall_health[wall_index] == 0:
+                      setattr(cell, wall_attr, False)
+                      setattr(neighbor_cell, opposite_wall_attr, False)
+                      self.structural_damage_left -= 1  # Damage when destroyed
+                      self.remove_wall(cell.pos, neighbor_pos)
+                      self.log.emit(INFO, "wall_destroyed_avalanche", pos=cell.pos)
+              else:
+                  # Recursive propagation if there are no obstacles.
+                  self.avalanche_dir(direction, neighbor_cell)
+          else:
+              # If the cell is not on fire, assign fire to it.
+              self.assign_fire(cell)
+
+
+    def remove_door(self, cell1, cell2, direction):
+        self.cells[cell1.pos[0]][cell1.pos[1]].door.remove(cell2.pos)
+        self.cells[cell2.pos[0]][cell2.pos[1]].door.remove(cell1.pos)
+        if direction == 0:
+            self.cells[cell1.pos[0]][cell1.pos[1]].up = False
+            self.cells[cell2.pos[0]][cell2.pos[1]].down = False
+        elif direction == 1:
+            self.cells[cell1.pos[0]][cell1.pos[1]].left = False
+            self.cells[cell2.pos[0]][cell2.pos[1]].right = False
+        elif direction == 2:
+            self.cells[cell1.pos[0]][cell1.pos[1]].down = False
+            self.cells[cell2.pos[0]][cell2.pos[1]].up = False
+        elif direction == 3:
+            self.cells[cell1.pos[0]][cell1.pos[1]].right = False
+            self.cells[cell2.pos[0]][cell2.pos[1]].left = False
+
+        # Registrar la puerta destruida
+        door_info = {
+            "cell1": cell1.pos,
+            "cell2": cell2.pos,
+            "direction": ["up", "left", "down", "right"][direction]
+        }
+        self.destroyed_doors.append(door_info)
+        self.edge_costs.refresh(self.cells, [cell1.pos, cell2.pos])
+        self.invalidate_paths([cell1.pos, cell2.pos], cheaper=True)
+
+        self.log.emit(INFO, "door_removed", cell1=cell1.pos, cell2=cell2.pos, direction=door_info['direction'])
+
+    # Esta función registra un cambio del tablero en las celdas dadas e invalida los campos de distancia guardados
+    # cheaper indica si el cambio pudo abaratar algún camino (pared, puerta o fuego removidos)
+    def invalidate_paths(self, positions, cheaper=False):
+        self.board_version += 1
+        self.board_changes.append((positions, cheaper))
+        self.distance_fields.clear()
+
+    # Esta función indica si un camino calculado en since_version sigue siendo óptimo
+    def path_still_valid(self, path, since_version):
+        for positions, cheaper in self.board_changes[since_version:]:
+            if cheaper:
+                return False
+            for pos in positions:
+                if pos in path:
+                    return False
+        return True
+
+    # Esta función regresa la función de costo entre índices planos para el motor de caminos
+    # Lee la tabla edge_costs: pared, puerta o camino abierto, más el fuego de la celda destino y el costo por moverse
+    def edge_cost_fn(self, lleva_puffle=1):
+        return self.edge_costs.edge_cost_fn(self.move_cost * lleva_puffle)
+
+    # Esta función regresa el campo de distancias (y predecesores) desde source; se calcula a lo más una vez por versión del tablero
+    def distance_field(self, source, lleva_puffle=1):
+        key = (source, lleva_puffle)
+        field = self.distance_fields.get(key)
+        if field is None:
+            engine = self.path_engine
+            engine.search([engine.index(source)], self.edge_cost_fn(lleva_puffle))
+            field = (engine.dist.copy(), engine.prev.copy())
+            self.distance_fields[key] = field
+        return field
+
+    def path_cost(self, start, end, lleva_puffle=1):
+        """Costo del camino más corto de start a end (0 si son iguales o no hay camino)."""
+        engine = self.path_engine
+        if start == end or not engine.contains(start) or not engine.contains(end):
+            return 0
+        dist, _ = self.distance_field(start, lleva_puffle)
+        steps = dist[engine.index(end)]
+        return steps if steps != INF else 0
+
+    def shortest_path(self, start, end, lleva_puffle=1):
+        """Camino y costo de start a end con la misma convención que PenguinAgent.dijkstra."""
+        engine = self.path_engine
+        field = self.distance_fields.get((start, lleva_puffle))
+        if field is None:
+            # Sin campo guardado basta una búsqueda que se detenga en end
+            return engine.shortest_path(start, end, self.edge_cost_fn(lleva_puffle))
+        if start == end or not engine.contains(end):
+            return [end], 0
+        return engine.path_to(engine.index(end), field[1]), self.path_cost(start, end, lleva_puffle)
+
+    # Esta función cambia el estado de una celda (0 nada, 1 humo, 2 fuego); todo cambio de fuego pasa por aquí
+    # para que smokes y fire_points estén siempre al día sin recorrer el tablero
+    def set_fire(self, cell, state):
+        before = cell.fire
+        if before == state:
+            return
+        cell.fire = state
+        if before == 1:
+            self.smokes.remove(cell)
+        elif before == 2:
+            self.fire_points.remove(cell)
+        if state == 1:
+            self.smokes.append(cell)
+        elif state == 2:
+            self.fire_points.append(cell)
+        self.log.emit(TRACE, "hazard", pos=cell.pos, before=before, after=state)
+        self.edge_costs.set_fire(cell.pos, state)
+        # Solo el fuego cambia el costo de las rutas; apagarlo las abarata
+        if (before == 2) != (state == 2):
+            self.invalidate_paths([cell.pos], cheaper=state != 2)
+
+    # Esta función asigna el estado de fuego a una celda
+    def assign_fire(self, cell):
+        self.set_fire(cell, 2)
+
+    # Esta función convierte en fuego, en una sola pasada, todos los humos conectados a un fuego (flashover)
+    def flashover(self):
+        """
+        Cada humo con un fuego adyacente sin pared de su lado se convierte, en cadena, hasta que ya no cambia nada.
+        Se convierte siempre primero el humo que aparece antes en self.smokes.
+        """
+        smokes = self.smokes.copy()
+        order = {smoke.pos: i for i, smoke in enumerate(smokes)}
+        heap = [i for i, smoke in enumerate(smokes) if self._smoke_touches_fire(smoke)]
+        queued = set(heap)
+        heapq.heapify(heap)
+
+        while heap:
+            smoke = smokes[heapq.heappop(heap)]
+            self._convert_smoke_to_fire(smoke)
+
+            # Los humos vecinos sin pared hacia esta celda ahora tocan fuego
+            x, y = smoke.pos
+            for nx, ny, wall_attr in ((x - 1, y, "down"), (x, y - 1, "right"), (x + 1, y, "up"), (x, y + 1, "left")):
+                i = order.get((nx, ny))
+                if i is not None and i not in queued and not getattr(smokes[i], wall_attr):
+                    queued.add(i)
+                    heapq.heappush(heap, i)
+
+    def _smoke_touches_fire(self, smoke):
+        x, y = smoke.pos
+        return (
+            (x > 0 and self.cells[x - 1][y].fire == 2 and not smoke.up) or
+            (x < self.height - 1 and self.cells[x + 1][y].fire == 2 and not smoke.down) or
+            (y > 0 and self.cells[x][y - 1].fire == 2 and not smoke.left) or
+            (y < self.width - 1 and self.cells[x][y + 1].fire == 2 and not smoke.right)
+        )
+
+    def _convert_smoke_to_fire(self, smoke):
+        self.set_fire(smoke, 2)  # Pasa la celda de smokes a fire_points
+
+
+    # Esta función determina el final de la simulación
+    def end_sim(self):
+        if self.structural_damage_left <= 0:
+            self.log.emit(INFO, "defeat_damage")
+            self.running = False
+        elif self.dead_lifes >= 4:
+            self.log.emit(INFO, "defeat_deaths")
+            self.running = False
+        elif self.saved_lifes >= 7:
+            self.log.emit(INFO, "victory")
+            self.running = False
+
+    # Esta función hace un gráfico del estado del mapa y los agentes
+    def plot_grid(self):
+        # matplotlib solo se importa al graficar para que importar el modelo sea rápido
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
+
+        grid = np.zeros((self.grid.width, self.grid.height))
+        for cell in self.grid.coord_iter():
+            contents = cell[0]
+            y, x = cell[1]
+            if contents:
+                grid[y][x] = 1  # negro donde están los agentes
+            elif self.cells[y][x].fire == 2:
+                grid[y][x] = 2  # rojo donde hay fuego
+            elif self.cells[y][x].fire == 1:
+                grid[y][x] = 3  # gris donde hay humo
+            elif self.cells[y][x].poi != 0:
+                grid[y][x] = 4  # azul donde hay puntos de interés
+
+        cmap = ListedColormap(['white', 'black', 'red', 'gray', 'blue'])
+        plt.imshow(grid, cmap=cmap)
+        plt.title(f"Paso: {self.steps}")
+        plt.show()
+        self.steps += 1
+
+    def get_open_doors(self):
+        """
+        Retorna una lista de puertas abiertas actuales.
+        Cada puerta se representa como una tupla de posiciones ordenadas.
+        """
+        doors = set()
+        for row in self.cells:
+            for cell in row:
+                for door_pos in cell.door:
+                    # Ordenar las posiciones para evitar duplicados (puerta A-B y B-A)
+                    door = tuple(sorted([cell.pos, door_pos]))
+                    doors.add(door)
+        return list(doors)
+
+    # Esta función genera un nuevo punto de interés
+    def generate_new_interest_point(self):
+        taken = self.interest_points.positions() | self.smokes.positions() | self.fire_points.positions()
+        candidates = [cell for cell in self.inside if cell.pos not in taken]
+        random_cell = self.poi_random.choice(candidates)
+        random_cell.poi = self.poi_random.randint(1, 2)
+        return random_cell
+
+    # Esta función asigna los puntos de interés o fuegos a cada agente
+    # Primero los puntos de interés que nadie persigue y, si hay más de 3 fuegos, los agentes que quedan libres van a un fuego
+    def assign_points(self):
+        while len(self.interest_points) < 3:
+            self.interest_points.append(self.generate_new_interest_point())
+        targeted = CellSet(agent.target for agent in self.schedule.agents if agent.target is not None)
+        interest_points = [cell for cell in self.interest_points if cell not in targeted]
+        if self.assignment == "greedy":
+            self.assign_greedy(interest_points, pick_agent=True)
+        else:
+            self.assign_optimal(interest_points)
+        if len(self.fire_points) > 3:
+            if self.assignment == "greedy":
+                self.assign_greedy(list(self.fire_points), pick_agent=False)
+            else:
+                self.assign_optimal(list(self.fire_points))
+
+    # Asignación voraz: cada objetivo (o cada agente, con pick_agent=False) toma al más cercano que siga libre
+    def assign_greedy(self, targets, pick_agent):
+        idle = [agent for agent in self.schedule.agents if agent.target is None]
+        if pick_agent:
+            for target in targets:
+                closest_agent = None
+                min_steps = MAX_ASSIGN_STEPS
+                for agent in idle:
+                    if agent.target is None:
+                        steps = self.path_cost(agent.pos, target.pos, agent.lleva_puffle)
+                        if steps < min_steps:
+                            min_steps = steps
+                            closest_agent = agent
+                if closest_agent is not None:
+                    closest_agent.target = target
+        else:
+            targets = targets.copy()
+            for agent in idle:
+                if len(targets) > 0:
+                    closest_target = None
+                    min_steps = MAX_ASSIGN_STEPS
+                    for target in targets:
+                        steps = self.path_cost(agent.pos, target.pos, agent.lleva_puffle)
+                        if steps < min_steps:
+                            min_steps = steps
+                            closest_target = target
+                    if closest_target is not None:
+                        agent.target = closest_target
+                        targets.remove(closest_target)
+
+    # Asignación óptima: la matriz agentes libres x objetivos sale de los campos de distancia (una búsqueda por agente)
+    # y se resuelve con el algoritmo húngaro para que la suma de pasos sea mínima
+    def assign_optimal(self, targets):
+        idle = [agent for agent in self.schedule.agents if agent.target is None]
+        if not idle or not targets:
+            return
+        # Los pares a MAX_ASSIGN_STEPS o más valen todos lo mismo, así uno imposible no decide a quién le toca uno posible
+        cost = [[min(self.path_cost(agent.pos, target.pos, agent.lleva_puffle), MAX_ASSIGN_STEPS) for target in targets]
+                for agent in idle]
+        for row, column in hungarian(cost):
+            # Igual que en la voraz, un objetivo a MAX_ASSIGN_STEPS pasos o más no se asigna
+            if cost[row][column] < MAX_ASSIGN_STEPS:
+                idle[row].target = targets[column]
+
+    def remove_wall(self, start_pos, end_pos):
+        """
+        Removes a wall between two cells.
+        """
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+
+        # Determine the direction of the wall to remove
+        if x1 == x2:
+            if y1 < y2:
+                direction = "right"
+                opposite_direction = "left"
+            else:
+                direction = "left"
+                opposite_direction = "right"
+        elif y1 == y2:
+            if x1 < x2:
+                direction = "down"
+                opposite_direction = "up"
+            else:
+                direction = "up"
+                opposite_direction = "down"
+
+        # Remove the wall between the cells
+        setattr(self.cells[x1][y1], direction, False)
+        setattr(self.cells[x2][y2], opposite_direction, False)
+
+        # Register the destroyed wall
+        wall_info = {
+            "cell": (x1, y1),
+            "neighbor": (x2, y2),
+            "direction": direction
+        }
+        self.destroyed_walls.append(wall_info)
+        self.edge_costs.refresh(self.cells, [start_pos, end_pos])
+        self.invalidate_paths([start_pos, end_pos], cheaper=True)
+
+        self.log.emit(INFO, "wall_removed", start=start_pos, end=end_pos, direction=direction)
+
+    # Esta función indica las acciones que se toman en cada paso de la simulación
+    def step(self):
+        self.end_sim()
+        self.log.emit(INFO, "status", saved_lifes=self.saved_lifes, dead_lifes=self.dead_lifes, structural_damage_left=self.structural_damage_left, dead_agents=self.dead_agents)
+        if self.running:
+            if self.steps > 0:
+                self.snowfall()
+            # smokes y fire_points ya están al día (set_fire); solo se ordenan por posición para que el orden
+            # en que se reparten los fuegos y se mandan a Unity no dependa de cuándo apareció cada uno
+            self.smokes.sort()
+            self.fire_points.sort()
+            self.flashover()
+            for agent in list(self.schedule.agents):  # Convertir a lista para iterar de manera segura
+                current_cell = self.cells[agent.pos[0]][agent.pos[1]]
+                if current_cell in self.fire_points:
+                    if agent.lleva_puffle == 2:
+                        agent.lleva_puffle = 1
+                        self.dead_lifes += 1
+                        self.dead_agents += 1
+                        self.position_agent(agent)
+                        self.log.emit(INFO, "agent_died_rescuing", agent_id=agent.unique_id, pos=agent.pos)
+                    else:
+                        self.dead_agents += 1
+                        self.position_agent(agent)
+                        self.log.emit(INFO, "agent_died", agent_id=agent.unique_id, pos=agent.pos)
+            if len(self.interest_points) > 0:
+                for interest_point in self.interest_points.copy():  # Usar .copy() para evitar errores durante la iteración
+                    if interest_point in self.fire_points:
+                        if interest_point.poi == 2:
+                            self.dead_lifes += 1
+                            self.log.emit(INFO, "victim_lost", pos=interest_point.pos)
+                        elif interest_point.poi == 1:
+                            self.log.emit(INFO, "false_alarm_burned", pos=interest_point.pos)
+                        self.interest_points.remove(interest_point)
+            self.assign_points()
+            # self.plot_grid()
+            if self.log.enabled(DEBUG):
+                for punto_interes in self.interest_points:
+                    self.log.emit(DEBUG, "poi", pos=punto_interes.pos)
+                self.log.emit(DEBUG, "section_end")
+                for punto_fuego in self.fire_points:
+                    self.log.emit(DEBUG, "fire", pos=punto_fuego.pos)
+                self.log.emit(DEBUG, "section_end")
+                for agent in self.schedule.agents:
+                    target_pos = list(agent.target.pos) if agent.target else None
+                    self.log.emit(DEBUG, "agent", agent_id=agent.unique_id, pos=agent.pos, target=target_pos)
+                self.log.emit(DEBUG, "section_end")
+            self.schedule.step()
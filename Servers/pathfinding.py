@@ -0,0 +1,206 @@
+# Librerías
+import heapq
+
+INF = float('inf')
+
+_adjacency = {}
+
+
+# Función que regresa la tabla de vecinos de von Neumann de un tablero: adjacency[i] son los índices vecinos de la
+# celda i en el mismo orden que MultiGrid.get_neighborhood (arriba, izquierda, derecha, abajo).
+# Se arma una sola vez por tamaño de tablero y se comparte entre todos los modelos
+def adjacency(height, width):
+    key = (height, width)
+    if key not in _adjacency:
+        table = []
+        for index in range(height * width):
+            x, y = divmod(index, width)
+            neighbors = []
+            if x > 0:
+                neighbors.append(index - width)
+            if y > 0:
+                neighbors.append(index - 1)
+            if y < width - 1:
+                neighbors.append(index + 1)
+            if x < height - 1:
+                neighbors.append(index + width)
+            table.append(tuple(neighbors))
+        _adjacency[key] = tuple(table)
+    return _adjacency[key]
+
+# Motor de caminos más cortos sobre índices planos (x * width + y)
+class PathEngine():
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.size = height * width
+        self.adjacency = adjacency(height, width)
+
+        # Arreglos preasignados que se reutilizan en cada búsqueda
+        self._inf = [INF] * self.size
+        self._none = [-1] * self.size
+        self.dist = self._inf.copy()
+        self.prev = self._none.copy()
+
+    def index(self, pos):
+        return pos[0] * self.width + pos[1]
+
+    def position(self, index):
+        return divmod(index, self.width)
+
+    def contains(self, pos):
+        return 0 <= pos[0] < self.height and 0 <= pos[1] < self.width
+
+    def neighbors(self, index):
+        """Vecinos de von Neumann en el mismo orden que MultiGrid.get_neighborhood."""
+        return self.adjacency[index]
+
+    def search(self, sources, edge_cost, goal=-1, targets=None):
+        """
+        Dijkstra con heap desde uno o varios orígenes. edge_cost(u, v) da el costo
+        de moverse de u a v. Si se indica goal, la búsqueda se detiene al fijarlo;
+        si se indica un conjunto targets, se detiene cuando ya se fijaron todos los
+        objetivos empatados con el más cercano.
+        Deja las distancias y predecesores en self.dist y self.prev.
+        """
+        dist = self.dist
+        prev = self.prev
+        dist[:] = self._inf
+        prev[:] = self._none
+
+        heap = []
+        counter = 0
+        for source in sources:
+            dist[source] = 0
+            prev[source] = source
+            heap.append((0, counter, source))
+            counter += 1
+        heapq.heapify(heap)
+
+        done = [False] * self.size
+        neighbors = self.adjacency
+        nearest = INF
+        while heap:
+            steps, _, current = heapq.heappop(heap)
+            if done[current]:
+                continue
+            if steps > nearest:
+                break
+            done[current] = True
+            if current == goal:
+                break
+            if targets is not None and current in targets:
+                nearest = steps
+
+            for neighbor in neighbors[current]:
+                if done[neighbor]:
+                    continue
+                new_steps = steps + edge_cost(current, neighbor)
+                if new_steps < dist[neighbor]:
+                    dist[neighbor] = new_steps
+                    prev[neighbor] = current
+                    heapq.heappush(heap, (new_steps, counter, neighbor))
+                    counter += 1
+        return dist
+
+    def path_to(self, target, prev=None):
+        """
+        Reconstruye el camino (sin el origen) hasta target como lista de posiciones.
+        Usa los predecesores de la última búsqueda o los de un campo guardado (prev).
+        """
+        if prev is None:
+            prev = self.prev
+        if prev[target] == -1:
+            return []
+        path = []
+        current = target
+        while prev[current] != current:
+            path.append(divmod(current, self.width))
+            current = prev[current]
+        path.reverse()
+        return path
+
+    def shortest_path(self, start, end, edge_cost):
+        """Camino y costo de start a end con la misma convención que PenguinAgent.dijkstra."""
+        if start == end or not self.contains(start) or not self.contains(end):
+            return [end], 0
+        goal = self.index(end)
+        self.search([self.index(start)], edge_cost, goal)
+        steps = self.dist[goal]
+        return self.path_to(goal), (steps if steps != INF else 0)
+
+    def nearest(self, start, targets, edge_cost):
+        """
+        Con una sola búsqueda desde start regresa (posición, camino, costo) del
+        objetivo más cercano. Los empates se resuelven por el orden de targets.
+        """
+        indices = [self.index(pos) for pos in targets]
+        self.search([self.index(start)], edge_cost, targets=set(indices))
+        best = None
+        for index in indices:
+            if best is None or self.dist[index] < self.dist[best]:
+                best = index
+        if best is None or self.dist[best] == INF:
+            return None, [], 0
+        return self.position(best), self.path_to(best), self.dist[best]
+
+
+# Tabla de costos de las aristas del tablero para la búsqueda de caminos.
+# base es un arreglo plano de 4 x height x width: base[d * size + i] es lo que cuesta salir de la celda i
+# hacia la dirección d (0 arriba, 1 izquierda, 2 abajo, 3 derecha): 0 si está abierto, door_cost si hay puerta
+# y wall_cost si hay pared. fire[i] es el recargo por entrar a la celda i si tiene fuego.
+# Solo se recalculan las celdas que cambian (refresh para paredes y puertas, set_fire para el fuego)
+class EdgeCosts():
+    OFFSETS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+    WALLS = (("up", "down"), ("left", "right"), ("down", "up"), ("right", "left"))
+
+    def __init__(self, height, width, wall_cost, door_cost, fire_cost):
+        self.height = height
+        self.width = width
+        self.size = height * width
+        self.wall_cost = wall_cost
+        self.door_cost = door_cost
+        self.fire_cost = fire_cost
+        self.base = [0] * (4 * self.size)
+        self.fire = [0] * self.size
+        # Dirección de la arista u -> v según v - u (solo para celdas vecinas)
+        self.direction = {-width: 0, -1: 1, width: 2, 1: 3}
+
+    def build(self, cells):
+        for row in cells:
+            for cell in row:
+                self._update_cell(cells, cell)
+
+    def _update_cell(self, cells, cell):
+        # Las cuatro aristas que salen de cell y su recargo por fuego
+        x, y = cell.pos
+        index = x * self.width + y
+        for d, (dx, dy) in enumerate(self.OFFSETS):
+            nx, ny = x + dx, y + dy
+            cost = 0
+            if 0 <= nx < self.height and 0 <= ny < self.width:
+                wall, opposite = self.WALLS[d]
+                if getattr(cells[nx][ny], opposite) or getattr(cell, wall):
+                    cost = self.wall_cost if (nx, ny) not in cell.door else self.door_cost
+            self.base[d * self.size + index] = cost
+        self.fire[index] = self.fire_cost if cell.fire == 2 else 0
+
+    def refresh(self, cells, positions):
+        """Recalcula las aristas que salen y llegan a cada posición (después de quitar una pared o puerta)."""
+        neighbors = adjacency(self.height, self.width)
+        for x, y in positions:
+            self._update_cell(cells, cells[x][y])
+            for neighbor in neighbors[x * self.width + y]:
+                nx, ny = divmod(neighbor, self.width)
+                self._update_cell(cells, cells[nx][ny])
+
+    def set_fire(self, pos, state):
+        self.fire[pos[0] * self.width + pos[1]] = self.fire_cost if state == 2 else 0
+
+    def edge_cost_fn(self, move_cost):
+        """Función edge_cost(u, v) para PathEngine entre celdas vecinas: base + fuego en v + move_cost."""
+        base, fire, direction, size = self.base, self.fire, self.direction, self.size
+
+        def edge_cost(u, v):
+            return base[direction[v - u] * size + u] + fire[v] + move_cost
+        return edge_cost
@@ -0,0 +1,52 @@
+# Colecciones de celdas con pertenencia en O(1): outside, inside, fire_points, smokes e interest_points del modelo.
+# Se usan igual que las listas que reemplazan (append, remove, in, índices, copy) y mantienen el orden de inserción,
+# así las elecciones aleatorias y la salida para Unity no cambian
+
+
+# Celdas indexadas por posición; cada posición aparece una sola vez
+class CellSet():
+    def __init__(self, cells=()):
+        self._cells = {cell.pos: cell for cell in cells}
+        self._list = None  # lista en orden, se arma solo cuando se pide un índice
+
+    def __contains__(self, cell):
+        try:
+            return cell.pos in self._cells
+        except AttributeError:
+            return False  # None u otro objeto que no es celda
+
+    def __iter__(self):
+        # Como con una lista, para quitar celdas mientras se recorre hay que recorrer una copia
+        return iter(self._cells.values())
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __getitem__(self, index):
+        if self._list is None:
+            self._list = list(self._cells.values())
+        return self._list[index]
+
+    def __repr__(self):
+        return f"CellSet({[cell.pos for cell in self._cells.values()]})"
+
+    def positions(self):
+        return self._cells.keys()
+
+    def append(self, cell):
+        self._cells[cell.pos] = cell
+        self._list = None
+
+    def remove(self, cell):
+        if cell not in self:
+            raise ValueError(f"{cell.pos} no está en el conjunto")
+        del self._cells[cell.pos]
+        self._list = None
+
+    def sort(self):
+        """Ordena las celdas por posición (orden de filas, como al recorrer el tablero)."""
+        self._cells = dict(sorted(self._cells.items()))
+        self._list = None
+
+    def copy(self):
+        return CellSet(self._cells.values())
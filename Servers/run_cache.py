@@ -0,0 +1,101 @@
+# Caché de corridas terminadas: en memoria (LRU) y en disco por contenido.
+# La llave es el hash del mapa, la semilla, el número de agentes y la versión de las reglas (model.RULES_VERSION):
+# la misma llave siempre produce la misma corrida, así que se puede reutilizar sin volver a simular
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from model import RULES_VERSION
+
+_map_digests = {}
+
+
+# Función que regresa el hash SHA-256 del contenido de un mapa (se recalcula si el archivo cambia)
+def map_digest(map_path='final.txt'):
+    stat = os.stat(map_path)
+    cache_key = (os.path.abspath(map_path), stat.st_mtime_ns, stat.st_size)
+    if cache_key not in _map_digests:
+        with open(map_path, 'rb') as map_file:
+            _map_digests[cache_key] = hashlib.sha256(map_file.read()).hexdigest()
+    return _map_digests[cache_key]
+
+
+# Función que arma la llave de una corrida
+def run_key(map_path, seed, num_agents, rules_version=RULES_VERSION):
+    text = f"{map_digest(map_path)}:{seed}:{num_agents}:{rules_version}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# Caché de resultados {"summary": ..., "map_data": ...}; map_data es opcional (las corridas en lote solo guardan el resumen)
+class RunCache():
+    def __init__(self, directory='run_cache', max_entries=64):
+        self.directory = directory  # None = solo en memoria
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json.gz')
+
+    def _lookup(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is None and self.directory is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+        return entry
+
+    def get(self, key, need_map_data=False):
+        """Regresa el resultado guardado o None; con need_map_data, uno sin map_data cuenta como ausente."""
+        entry = self._lookup(key)
+        if entry is None or (need_map_data and "map_data" not in entry):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, result):
+        """Guarda un resultado; no reemplaza uno con map_data por otro que no lo tiene."""
+        current = self._lookup(key)
+        if current is not None and "map_data" in current and "map_data" not in result:
+            return
+        self._remember(key, result)
+        if self.directory is not None:
+            self._store(key, result)
+
+    def _remember(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _load(self, key):
+        try:
+            with gzip.open(self._path(key), 'rt', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            # No existe o quedó incompleto: se trata como ausente y se vuelve a simular
+            return None
+
+    def _store(self, key, entry):
+        # Se escribe en un temporal y se renombra, así otro proceso nunca lee un archivo a medias
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as raw_file, gzip.open(raw_file, 'wt', encoding='utf-8') as cache_file:
+                json.dump(entry, cache_file, separators=(',', ':'))
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
@@ -0,0 +1,278 @@
+# Librerías
+import json
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from events import DEBUG, INFO, SILENT, EventLog
+from binary_trajectory import BinaryTrajectoryWriter
+from model import MapModel, load_template
+from run_cache import run_key
+from trajectory import TrajectoryWriter, build_map_data
+
+# Función que captura el estado del modelo después de un paso como un registro de la trayectoria
+def capture_step(model, step, previous):
+    # Captura el estado de los agentes después del paso
+    step_agents = []
+    for agent in model.schedule.agents:
+        step_agents.append({
+            "agent_id": agent.unique_id,
+            "position": list(agent.pos),  # Convertir a lista para JSON serializable
+            "lleva_puffle": agent.lleva_puffle,
+            "target": list(agent.target.pos) if agent.target else None
+        })
+
+    # Captura el estado de los POIs después del paso
+    # Asegura que siempre haya exactamente 3 POIs
+    current_pois = model.interest_points[:3]  # Tomar los primeros 3 POIs
+
+    record = {
+        "type": "step",
+        "step": step,
+        "agents": step_agents,
+        "fire_expansion": [{"position": list(cell.pos), "state": "fire"} for cell in model.fire_points],
+        "smoke_expansion": [{"position": list(cell.pos), "state": "smoke"} for cell in model.smokes],
+        "pois": [{
+            "position": list(cell.pos),
+            "type": "victim" if cell.poi == 2 else "false_alarm"
+        } for cell in current_pois],
+        # Muertes y otros parámetros por paso
+        "victims_dead": model.dead_lifes - previous["dead_lifes"],
+        "agents_dead": model.dead_agents - previous["dead_agents"],
+        "saved_lifes": model.saved_lifes - previous["saved_lifes"],
+        "structural_damage_left": model.structural_damage_left,
+        # Puertas y paredes destruidas en este paso y puertas abiertas
+        "destroyed_doors": model.destroyed_doors.copy(),
+        "destroyed_walls": model.destroyed_walls.copy(),
+        "open_doors": model.get_open_doors(),
+    }
+
+    # Depuración: Imprime el número de fuegos, humos, POIs, muertes y otros parámetros en este paso
+    model.log.emit(INFO, "step_summary", step=model.steps, fires=len(model.fire_points), smokes=len(model.smokes), pois=len(model.interest_points),
+                   victims_dead=record["victims_dead"], agents_dead=record["agents_dead"], saved_lifes=record["saved_lifes"], structural_damage_left=record["structural_damage_left"])
+    if model.log.enabled(DEBUG):
+        for cell in model.fire_points:
+            model.log.emit(DEBUG, "fire", pos=cell.pos)
+        for cell in model.smokes:
+            model.log.emit(DEBUG, "smoke", pos=cell.pos)
+        for poi in current_pois:
+            poi_type = "Víctima" if poi.poi == 2 else "Falsa Alarma"
+            model.log.emit(DEBUG, "step_poi", pos=poi.pos, poi_type=poi_type)
+        model.log.emit(DEBUG, "section_end")
+
+    return record
+
+# Generador que avanza el modelo hasta que termina y entrega el registro de cada paso en cuanto termina
+def iter_steps(model):
+    # Contadores previos para calcular muertes y otros parámetros por paso
+    previous = {"dead_lifes": 0, "dead_agents": 0, "saved_lifes": 0}
+
+    step = 0
+    while model.running:
+        # Ejecuta el paso de la simulación
+        model.step()
+
+        # Incrementa el contador de pasos
+        model.steps += 1
+
+        # Actualiza el contador de agentes en cada celda
+        for cell in model.grid.coord_iter():
+            contents = cell[0]
+            x, y = cell[1]
+
+            for _ in contents:
+                model.cells[x][y].inside_agents += 1
+
+        record = capture_step(model, step, previous)
+
+        # Reiniciar las listas de destrucciones para el siguiente paso
+        model.destroyed_doors = []
+        model.destroyed_walls = []
+
+        # Actualiza los contadores previos
+        previous = {"dead_lifes": model.dead_lifes, "dead_agents": model.dead_agents, "saved_lifes": model.saved_lifes}
+
+        # Resetea el contador de agentes en las celdas para el siguiente paso
+        for cell in model.grid.coord_iter():
+            contents = cell[0]
+            x, y = cell[1]
+            model.cells[x][y].insisde_agents = 0
+
+        yield record
+        step += 1
+
+# Función que resume cómo terminó una simulación (va en el registro final de la trayectoria)
+def summarize(model):
+    return {
+        "seed": model.seed,
+        "steps": model.steps,
+        "saved_lifes": model.saved_lifes,
+        "dead_lifes": model.dead_lifes,
+        "dead_agents": model.dead_agents,
+        "structural_damage_left": model.structural_damage_left,
+    }
+
+# Función que corre una simulación completa y construye los datos de cada paso para Unity (map_data)
+# Si se da writer (TrajectoryWriter), cada paso también se escribe en cuanto termina
+def run_simulation(model, writer=None):
+    records = []
+    for record in iter_steps(model):
+        if writer is not None:
+            writer.write(record)
+        records.append(record)
+    if writer is not None:
+        writer.close(summarize(model))
+    return build_map_data(records)
+
+# Función que corre una simulación escribiendo cada paso en un NDJSON sin guardar la trayectoria en memoria
+# Con binary se escribe en el formato binario de binary_trajectory.py (fsync no aplica)
+def record_simulation(model, path, fsync=False, binary=False):
+    writer = BinaryTrajectoryWriter.for_model(path, model) if binary else TrajectoryWriter(path, fsync=fsync)
+    with writer:
+        for record in iter_steps(model):
+            writer.write(record)
+        writer.close(summarize(model))
+    return summarize(model)
+
+# Función que guarda map_data en un archivo JSON
+def save_map_data(map_data, path='simulation_data.json'):
+    with open(path, 'w') as json_file:
+        json.dump(map_data, json_file, indent=4)
+
+# Función que corre una simulación sin capturar los pasos y regresa su resumen
+# template (model.MapTemplate): plantilla del mapa ya armada; si no se da se usa la de final.txt
+def simulate(seed=None, log_level=SILENT, num_agents=6, template=None):
+    model = MapModel(num_agents, seed=seed, log_level=log_level, template=template)
+    
+    while model.running:
+        model.step()
+        model.steps += 1
+
+    return summarize(model)
+
+# Función que convierte el resumen de una corrida en su resultado (victoria o derrota y el motivo)
+def resultado_de(summary):
+    # Determinar si fue victoria o derrota
+    if summary["saved_lifes"] >= 7:
+        return {"resultado": "victoria", "motivo": None, "rescates": summary["saved_lifes"], "semilla": summary["seed"], "pasos": summary["steps"]}
+    else:
+        # Determinar el motivo de la derrota
+        if summary["structural_damage_left"] <= 0:
+            motivo = "Daño estructural"
+        elif summary["dead_lifes"] >= 4:
+            motivo = "Demasiadas muertes"
+        else:
+            motivo = "Otro"
+
+        return {
+            "resultado": "derrota",
+            "motivo": motivo,
+            "rescates": summary["saved_lifes"],
+            "semilla": summary["seed"],
+            "pasos": summary["steps"]
+        }
+
+# Función para ejecutar una simulación y devolver el resultado
+# cache (run_cache.RunCache): si la corrida con esta semilla ya está guardada no se vuelve a simular
+def run_single_simulation(seed=None, log_level=SILENT, cache=None):
+    key = run_key('final.txt', seed, 6) if cache is not None and seed is not None else None
+    entry = cache.get(key) if key is not None else None
+    if entry is not None:
+        return resultado_de(entry["summary"])
+
+    summary = simulate(seed, log_level)
+    if cache is not None:
+        cache.put(run_key('final.txt', summary["seed"], 6), {"summary": summary})
+    return resultado_de(summary)
+
+# Semilla de la corrida run_index derivada de la semilla maestra; no depende de cuántos procesos se usen
+def derive_seed(master_seed, run_index):
+    return int(np.random.SeedSequence([master_seed, run_index]).generate_state(1)[0])
+
+# Función para repetir exactamente la corrida run_index de un lote ejecutado con la semilla maestra master_seed
+def replay_simulation(master_seed, run_index):
+    return run_single_simulation(derive_seed(master_seed, run_index))
+
+# Plantilla del mapa que usan las corridas de un lote; cada proceso del pool la recibe una vez al arrancar
+_batch_template = None
+
+def _init_batch(template):
+    global _batch_template
+    _batch_template = template
+
+# Función que ejecuta cada proceso del pool: recibe (índice, semilla) y regresa el resumen con su índice
+def _run_indexed(task):
+    run_index, seed = task
+    return run_index, simulate(seed, template=_batch_template)
+
+# Función que agrega un resultado al diccionario de resultados
+def agregar_resultado(resultados, resultado):
+    if resultado["resultado"] == "victoria":
+        resultados["victoria"] += 1
+    else:
+        resultados["derrota"] += 1
+        resultados["motivos_derrota"][resultado["motivo"]] += 1
+        resultados["rescates_derrota"].append(resultado["rescates"])
+
+# Ejecutar múltiples simulaciones y recolectar resultados detallados
+# workers: procesos a usar (None = todos los núcleos), chunk_size: corridas que recibe cada proceso a la vez
+# seed: semilla maestra; cada corrida i usa derive_seed(seed, i), así los resultados no dependen de workers
+# cache (run_cache.RunCache): las corridas ya guardadas no se mandan al pool
+# log_level: DEBUG imprime cada corrida, INFO solo el resumen del lote y SILENT nada
+def run_multiple_simulations(num_runs=500, workers=None, chunk_size=8, seed=None, cache=None, log_level=DEBUG):
+    log = EventLog(log_level)
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (2 ** 32))
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    resultados = {
+        "victoria": 0,
+        "derrota": 0,
+        "motivos_derrota": {
+            "Daño estructural": 0,
+            "Demasiadas muertes": 0,
+            "Otro": 0
+        },
+        "rescates_derrota": [],
+        "semilla": seed
+    }
+
+    seeds = {i: derive_seed(seed, i) for i in range(1, num_runs + 1)}
+    cached = {}
+    if cache is not None:
+        for i, run_seed in seeds.items():
+            entry = cache.get(run_key('final.txt', run_seed, 6))
+            if entry is not None:
+                cached[i] = entry["summary"]
+
+    tasks = ((i, run_seed) for i, run_seed in seeds.items() if i not in cached)
+    # El mapa se lee una sola vez por lote; cada corrida solo copia la plantilla
+    template = load_template('final.txt')
+    _init_batch(template)
+    pool = Pool(workers, initializer=_init_batch, initargs=(template,)) if workers > 1 and len(cached) < num_runs else None
+    try:
+        # imap entrega los resultados en orden conforme terminan, sin guardarlos todos en memoria
+        results = pool.imap(_run_indexed, tasks, chunksize=chunk_size) if pool else map(_run_indexed, tasks)
+        for i in seeds:
+            if i in cached:
+                summary = cached[i]
+            else:
+                _, summary = next(results)
+                if cache is not None:
+                    cache.put(run_key('final.txt', seeds[i], 6), {"summary": summary})
+            resultado = resultado_de(summary)
+            agregar_resultado(resultados, resultado)
+            log.emit(DEBUG, "run_result", run=i, resultado=resultado['resultado'])
+    finally:
+        if pool is not None:
+            pool.terminate()
+    
+    log.emit(INFO, "batch_summary", runs=num_runs, victorias=resultados['victoria'], derrotas=resultados['derrota'])
+    
+    # Guardar los resultados en un archivo JSON (opcional)
+    with open('resultados_simulaciones_detallados.json', 'w') as json_file:
+        json.dump(resultados, json_file, indent=4)
+    
+    return resultados
@@ -0,0 +1,285 @@
+# Librerías
+import json
+import sys
+from datetime import datetime, timezone
+
+from flask import Flask, Response, abort, jsonify, request
+
+from binary_trajectory import BinaryTrajectoryWriter
+from delta import encode_deltas, split_map_data
+from encoded import EncodedBody, EncodedCache
+from jobs import JobService
+from model import MapModel
+from run_cache import RunCache, run_key
+from runner import run_simulation, save_map_data, summarize
+from sessions import SessionRegistry
+from trajectory import CHANNELS, TrajectoryWriter
+
+# Nombres cortos que acepta ?channels= además de los nombres de map_data
+CHANNEL_ALIASES = {
+    "fire": ["fire_expansion"],
+    "smoke": ["smoke_expansion"],
+    "doors": ["open_doors", "destroyed_doors"],
+    "walls": ["destroyed_walls"],
+    "counters": ["victims_dead", "agents_dead", "saved_lifes", "structural_damage_left"],
+}
+
+MAX_PAGE = 100  # máximo de pasos por respuesta de /steps
+
+
+# Función que traduce ?channels=agents,fire a los canales de map_data (todos si no se da)
+def parse_channels(value):
+    if not value:
+        return list(CHANNELS)
+    channels = []
+    for name in value.split(","):
+        name = name.strip()
+        for channel in CHANNEL_ALIASES.get(name, [name]):
+            if channel not in CHANNELS:
+                abort(400, f"Canal desconocido: {name}")
+            if channel not in channels:
+                channels.append(channel)
+    return channels
+
+
+# Función que crea la API de Flask que sirve los datos de una simulación
+# "/" sirve el formato delta (ver DELTA_FORMAT.md), "/full" el map_data completo de siempre,
+# "/steps/<k>" un paso y "/steps?start=&limit=" una página de pasos; las dos últimas aceptan ?channels=
+def create_app(map_data, keyframe_interval=10):
+    app = Flask(__name__)
+    app.json.compact = True  # sin sangrías aunque el servidor corra en modo debug
+    payload = encode_deltas(map_data, keyframe_interval)
+    records = split_map_data(map_data)
+    last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    # Todo se serializa y comprime una sola vez: "/" y "/full" al crear la app, los pasos la primera vez que se piden
+    delta_body = EncodedBody(payload, last_modified)
+    full_body = EncodedBody(map_data, last_modified)
+    step_bodies = EncodedCache()
+
+    @app.route("/", methods=['GET'])
+    def get_data():
+        return delta_body.response(request)
+
+    @app.route("/full", methods=['GET'])
+    def get_full_data():
+        return full_body.response(request)
+
+    @app.route("/steps/<int:step>", methods=['GET'])
+    def get_step(step):
+        if not 0 <= step < len(records):
+            abort(404, f"El paso {step} no existe (la simulación tiene {len(records)} pasos)")
+        channels = parse_channels(request.args.get("channels"))
+        record = records[step]
+        body = step_bodies.get(("step", step, tuple(channels)), lambda: EncodedBody(
+            dict({"step": record["step"]}, **{channel: record[channel] for channel in channels}), last_modified))
+        return body.response(request)
+
+    # Página de pasos con la forma de map_data (Unity la puede leer como MapData), más start, end, total y next
+    @app.route("/steps", methods=['GET'])
+    def get_steps():
+        start = request.args.get("start", 0, type=int)
+        limit = min(request.args.get("limit", MAX_PAGE, type=int), MAX_PAGE)
+        if start < 0 or limit <= 0:
+            abort(400, "start debe ser >= 0 y limit > 0")
+        if start > len(records):
+            abort(404, f"El paso {start} no existe (la simulación tiene {len(records)} pasos)")
+        end = min(start + limit, len(records))
+        channels = parse_channels(request.args.get("channels"))
+
+        def build():
+            page = {channel: map_data[channel][start:end] for channel in channels}
+            page.update(start=start, end=end, total=len(records), next=end if end < len(records) else None)
+            return EncodedBody(page, last_modified)
+
+        return step_bodies.get(("steps", start, end, tuple(channels)), build).response(request)
+
+    return app
+
+# Función que crea la API de sesiones en vivo: cada sesión es un MapModel que avanza bajo demanda o con un tick
+#   POST   /sessions                  crea una sesión ({"seed", "num_agents", "tick"} opcionales)
+#   GET    /sessions[/<id>]           estado de las sesiones
+#   POST   /sessions/<id>/step?count= avanza la sesión y regresa los pasos nuevos
+#   GET    /sessions/<id>/events      Server-Sent Events con cada paso (acepta Last-Event-ID o ?from=)
+#   DELETE /sessions/<id>             cierra la sesión
+def create_live_app(registry=None):
+    app = Flask(__name__)
+    app.json.compact = True
+    registry = registry or SessionRegistry()
+
+    def get_session(session_id):
+        session = registry.get(session_id)
+        if session is None:
+            abort(404, f"La sesión {session_id} no existe")
+        return session
+
+    @app.route("/sessions", methods=['POST'])
+    def create_session():
+        options = request.get_json(silent=True) or {}
+        if not isinstance(options, dict):
+            abort(400, "El cuerpo debe ser un objeto JSON")
+        try:
+            session = registry.create(options.get("num_agents", 6), options.get("seed"), options.get("tick"))
+        except ValueError as error:
+            abort(400, str(error))
+        if session is None:
+            abort(503, f"Se alcanzó el máximo de {registry.max_sessions} sesiones")
+        return jsonify(session.status()), 201
+
+    @app.route("/sessions", methods=['GET'])
+    def list_sessions():
+        return jsonify([session.status() for session in registry])
+
+    @app.route("/sessions/<session_id>", methods=['GET'])
+    def get_session_status(session_id):
+        return jsonify(get_session(session_id).status())
+
+    @app.route("/sessions/<session_id>", methods=['DELETE'])
+    def delete_session(session_id):
+        get_session(session_id)
+        return jsonify(registry.remove(session_id).status())
+
+    @app.route("/sessions/<session_id>/step", methods=['POST'])
+    def step_session(session_id):
+        session = get_session(session_id)
+        count = request.args.get("count", 1, type=int)
+        if count <= 0:
+            abort(400, "count debe ser mayor que 0")
+        records = session.advance(count)
+        return jsonify({"records": records, "finished": session.finished, "summary": session.summary})
+
+    @app.route("/sessions/<session_id>/events", methods=['GET'])
+    def stream_session(session_id):
+        session = get_session(session_id)
+        # Un cliente que se reconecta manda el id del último paso que recibió
+        last_event = request.headers.get("Last-Event-ID", type=int)
+        start = last_event + 1 if last_event is not None else request.args.get("from", 0, type=int)
+        if start < 0:
+            abort(400, "from debe ser 0 o mayor")
+
+        def events():
+            for event in session.follow(start):
+                if event is None:
+                    yield ": keepalive\n\n"
+                elif event[0] == "step":
+                    yield f"id: {event[1]['step']}\nevent: step\ndata: {json.dumps(event[1], separators=(',', ':'))}\n\n"
+                else:
+                    yield f"event: end\ndata: {json.dumps(event[1])}\n\n"
+
+        return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    return app
+
+# Función que crea la API del servicio de corridas; la simulación corre en el pool de procesos de service
+#   POST   /jobs               encola una corrida ({"seed", "num_agents", "map"} opcionales) y regresa 202
+#   GET    /jobs[/<id>]        estado de los trabajos
+#   GET    /jobs/<id>/result   resumen y map_data (?format=delta para el formato delta); 202 si aún no termina
+#   DELETE /jobs/<id>          olvida un trabajo terminado
+def create_job_app(service):
+    app = Flask(__name__)
+    app.json.compact = True
+    job_bodies = EncodedCache(max_entries=64)
+
+    def get_job(job_id):
+        job = service.get(job_id)
+        if job is None:
+            abort(404, f"El trabajo {job_id} no existe")
+        return job
+
+    @app.route("/jobs", methods=['POST'])
+    def submit_job():
+        options = request.get_json(silent=True) or {}
+        if not isinstance(options, dict):
+            abort(400, "El cuerpo debe ser un objeto JSON")
+        try:
+            job = service.submit(options.get("num_agents", 6), options.get("seed"), options.get("map", "final.txt"))
+        except ValueError as error:
+            abort(400, str(error))
+        if job is None:
+            abort(503, f"Hay {service.max_pending} trabajos pendientes; intenta más tarde")
+        return jsonify(job.to_dict()), 202, {"Location": f"/jobs/{job.id}"}
+
+    @app.route("/jobs", methods=['GET'])
+    def list_jobs():
+        return jsonify([job.to_dict() for job in service])
+
+    @app.route("/jobs/<job_id>", methods=['GET'])
+    def get_job_status(job_id):
+        return jsonify(get_job(job_id).to_dict())
+
+    @app.route("/jobs/<job_id>", methods=['DELETE'])
+    def delete_job(job_id):
+        job = get_job(job_id)
+        if job.status == "pending":
+            abort(409, f"El trabajo {job_id} no ha terminado")
+        return jsonify(service.remove(job_id).to_dict())
+
+    @app.route("/jobs/<job_id>/result", methods=['GET'])
+    def get_job_result(job_id):
+        job = get_job(job_id)
+        if job.status == "pending":
+            return jsonify(job.to_dict()), 202
+        if job.status == "failed":
+            abort(500, f"El trabajo {job_id} falló: {job.error}")
+        # El resultado se serializa la primera vez que se pide en cada formato
+        last_modified = datetime.fromtimestamp(int(job.finished), timezone.utc)
+        if request.args.get("format") == "delta":
+            body = job_bodies.get((job.id, "delta"), lambda: EncodedBody(encode_deltas(job.result["map_data"]), last_modified))
+        else:
+            body = job_bodies.get((job.id, "full"), lambda: EncodedBody(job.result, last_modified))
+        return body.response(request)
+
+    return app
+
+# Función que sirve una app con waitress si está instalado (varios hilos, sin modo debug);
+# si no, con el servidor de Flask en modo multihilo
+def serve(app, port):
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        app.run(port=port, threaded=True)
+    else:
+        waitress_serve(app, port=port, threads=32)
+
+# Punto de entrada: corre una simulación (escribiendo cada paso en simulation_steps.ndjson), guarda el JSON y sirve los datos para Unity
+# Con seed, una corrida que ya está en la caché (run_cache) se sirve sin volver a simular
+# Con binary los pasos se escriben en simulation_steps.bin (binary_trajectory.py) en lugar del NDJSON
+def main(num_agents=6, seed=None, port=5001, cache=None, binary=False):
+    cache = cache or RunCache()
+    entry = cache.get(run_key('final.txt', seed, num_agents), need_map_data=True) if seed is not None else None
+    if entry is not None:
+        map_data = entry["map_data"]
+    else:
+        model = MapModel(num_agents, seed=seed)
+        if binary:
+            writer = BinaryTrajectoryWriter.for_model('simulation_steps.bin', model)
+        else:
+            writer = TrajectoryWriter('simulation_steps.ndjson')
+        map_data = run_simulation(model, writer)
+        cache.put(run_key('final.txt', model.seed, num_agents), {"summary": summarize(model), "map_data": map_data})
+    save_map_data(map_data)
+    app = create_app(map_data)
+    app.run(debug=True, port=port)
+
+# Punto de entrada del modo en vivo: no corre nada al arrancar, las sesiones se crean con POST /sessions
+def live_main(port=5001):
+    app = create_live_app()
+    app.run(port=port, threaded=True)
+
+# Punto de entrada del servicio de corridas: las simulaciones corren en workers procesos
+def jobs_main(port=5001, workers=None):
+    service = JobService(workers, cache=RunCache())
+    try:
+        serve(create_job_app(service), port)
+    finally:
+        service.close()
+
+# Uso: python server.py (una corrida precalculada; --binary guarda los pasos en simulation_steps.bin),
+# python server.py --live (sesiones en vivo) o python server.py --jobs (servicio de corridas en un pool de procesos)
+if __name__ == '__main__':
+    if "--live" in sys.argv:
+        live_main()
+    elif "--jobs" in sys.argv:
+        jobs_main()
+    else:
+        main(binary="--binary" in sys.argv)
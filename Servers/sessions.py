@@ -0,0 +1,163 @@
+# Sesiones en vivo: cada sesión tiene su propio MapModel que avanza cuando se pide o con un tick fijo,
+# y los suscriptores reciben cada paso en cuanto termina
+import itertools
+import threading
+import time
+
+from events import SILENT
+from jobs import MAX_AGENTS
+from model import MapModel
+from runner import iter_steps, summarize
+
+MAX_SESSIONS = 32  # sesiones sin terminar; más que esto se rechaza
+MAX_FINISHED = 32  # sesiones terminadas que se conservan para consultar su estado; se olvidan las más viejas
+IDLE_TIMEOUT = 600  # segundos sin avanzar ni seguirse después de los cuales una sesión se cierra
+
+
+# Una simulación en vivo; history guarda todos los pasos para que un suscriptor que llega tarde los reciba
+class LiveSession():
+    def __init__(self, session_id, num_agents=6, seed=None, tick=None):
+        self.id = session_id
+        self.num_agents = num_agents
+        self.model = MapModel(num_agents, seed=seed, log_level=SILENT)
+        self.steps = iter_steps(self.model)
+        self.history = []
+        self.summary = None
+        self.closed = False
+        self.lock = threading.Lock()  # solo un hilo avanza el modelo a la vez
+        self.changed = threading.Condition()  # avisa a los suscriptores que hay pasos nuevos
+        self.tick = tick
+        self.last_active = time.monotonic()
+        self._stop = threading.Event()
+        self._ticker = None
+        if tick:
+            self._ticker = threading.Thread(target=self._run_ticks, daemon=True)
+            self._ticker.start()
+
+    @property
+    def finished(self):
+        return self.summary is not None or self.closed
+
+    def advance(self, count=1):
+        """Avanza hasta count pasos y regresa los registros nuevos (menos si la simulación termina)."""
+        new_records = []
+        self.last_active = time.monotonic()
+        with self.lock:
+            for _ in range(count):
+                if self.finished:
+                    break
+                record = next(self.steps, None)
+                if record is None:
+                    self.summary = summarize(self.model)
+                    break
+                new_records.append(record)
+                if not self.model.running:
+                    self.summary = summarize(self.model)
+            with self.changed:
+                self.history.extend(new_records)
+                self.changed.notify_all()
+        return new_records
+
+    def _run_ticks(self):
+        # Avanza un paso cada tick segundos hasta que termina o se cierra la sesión
+        while not self.finished and not self._stop.wait(self.tick):
+            self.advance()
+
+    def close(self):
+        self._stop.set()
+        with self.changed:
+            self.closed = True
+            self.changed.notify_all()
+
+    def follow(self, start=0, keepalive=15):
+        """Genera ("step", registro) desde el paso start, ("end", resumen) al terminar y None cada keepalive segundos sin pasos."""
+        if start < 0:
+            raise ValueError("start debe ser 0 o mayor")
+        cursor = start
+        while True:
+            self.last_active = time.monotonic()
+            with self.changed:
+                if cursor >= len(self.history) and not self.finished:
+                    self.changed.wait(keepalive)
+                pending = self.history[cursor:]
+                finished = self.finished
+            for record in pending:
+                yield "step", record
+            cursor += len(pending)
+            if finished and cursor >= len(self.history):
+                yield "end", self.summary
+                return
+            if not pending:
+                yield None
+
+    def status(self):
+        return {
+            "id": self.id,
+            "seed": self.model.seed,
+            "num_agents": self.num_agents,
+            "steps": len(self.history),
+            "tick": self.tick,
+            "finished": self.finished,
+            "closed": self.closed,
+            "summary": self.summary,
+        }
+
+
+# Registro de las sesiones del servidor; solo las que no han terminado cuentan para max_sessions
+class SessionRegistry():
+    def __init__(self, max_sessions=MAX_SESSIONS, max_finished=MAX_FINISHED, idle_timeout=IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.max_finished = max_finished
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def create(self, num_agents=6, seed=None, tick=None):
+        """Crea una sesión; regresa None si ya hay max_sessions sin terminar. ValueError si los datos no son válidos."""
+        if isinstance(num_agents, bool) or not isinstance(num_agents, int) or not 0 < num_agents <= MAX_AGENTS:
+            raise ValueError(f"num_agents debe ser un entero entre 1 y {MAX_AGENTS}")
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+            raise ValueError("seed debe ser un entero mayor o igual que 0")
+        if tick is not None and (isinstance(tick, bool) or not isinstance(tick, (int, float)) or tick <= 0):
+            raise ValueError("tick debe ser un número mayor que 0")
+        with self.lock:
+            if self._full():
+                return None
+        # El modelo se arma sin tomar el lock para no detener a las demás peticiones mientras tanto
+        session = LiveSession(str(next(self._ids)), num_agents, seed, tick)
+        with self.lock:
+            if not self._full():
+                self.sessions[session.id] = session
+                return session
+        session.close()  # otra petición ocupó el último lugar mientras se armaba
+        return None
+
+    def _full(self):
+        # Hay max_sessions sin terminar (se llama con self.lock tomado)
+        self._evict()
+        return sum(not session.finished for session in self.sessions.values()) >= self.max_sessions
+
+    def _evict(self):
+        # Cierra las sesiones inactivas y olvida las terminadas más viejas (se llama con self.lock tomado)
+        now = time.monotonic()
+        for session in self.sessions.values():
+            if not session.finished and now - session.last_active > self.idle_timeout:
+                session.close()
+        finished = [session for session in self.sessions.values() if session.finished]
+        for session in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.sessions[session.id]
+
+    def get(self, session_id):
+        return self.sessions.get(session_id)
+
+    def remove(self, session_id):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+        return session
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.sessions.values()))
@@ -0,0 +1,48 @@
+# Pruebas de la asignación óptima (assignment.py y MapModel.assign_optimal); se corren con python -m pytest desde Servers
+import itertools
+import random
+
+from assignment import hungarian
+from events import SILENT
+from model import MAX_ASSIGN_STEPS, MapModel
+
+
+# Menor suma posible asignando min(filas, columnas) pares, probando todas las permutaciones
+def brute_force(cost):
+    n, m = len(cost), len(cost[0])
+    if n <= m:
+        return min(sum(cost[i][j] for i, j in enumerate(columns)) for columns in itertools.permutations(range(m), n))
+    return min(sum(cost[i][j] for j, i in enumerate(rows)) for rows in itertools.permutations(range(n), m))
+
+
+def test_hungarian_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(300):
+        n, m = rng.randint(1, 5), rng.randint(1, 5)
+        cost = [[rng.choice([rng.randint(0, 20), MAX_ASSIGN_STEPS]) for _ in range(m)] for _ in range(n)]
+        pairs = hungarian(cost)
+        assert len(pairs) == min(n, m)
+        assert len({i for i, _ in pairs}) == len({j for _, j in pairs}) == len(pairs)
+        assert sum(cost[i][j] for i, j in pairs) == brute_force(cost)
+
+
+def test_hungarian_empty():
+    assert hungarian([]) == []
+    assert hungarian([[]]) == []
+
+
+def test_assign_optimal_clamps_unreachable_targets():
+    model = MapModel(2, seed=0, log_level=SILENT)
+    first, second = sorted(model.schedule.agents, key=lambda agent: agent.unique_id)
+    model.grid.move_agent(first, (0, 0))
+    model.grid.move_agent(second, (0, 1))
+    near, far = model.cells[2][2], model.cells[5][7]
+    steps = {((0, 0), near.pos): 10, ((0, 1), near.pos): 20, ((0, 0), far.pos): 150, ((0, 1), far.pos): 500}
+    model.path_cost = lambda start, end, lleva_puffle=1: steps[(start, end)]
+    for agent in (first, second):
+        agent.target = None
+
+    # Sin el tope la suma mínima (20 + 150) mandaría al más cercano al objetivo imposible
+    model.assign_optimal([near, far])
+    assert first.target is near
+    assert second.target is None
@@ -0,0 +1,37 @@
+# Pruebas del formato binario de trayectorias (binary_trajectory.py); se corren con python -m pytest desde Servers
+import json
+
+import pytest
+
+from binary_trajectory import BinaryTrajectory
+from events import SILENT
+from model import MapModel
+from runner import record_simulation, run_simulation
+from trajectory import CHANNELS
+
+
+# El formato binario guarda las celdas como conjuntos, así que se comparan los datos de cada paso ordenados
+def canonical(map_data):
+    map_data = json.loads(json.dumps(map_data))
+    for channel, field in CHANNELS.items():
+        if field != "data":
+            continue
+        for step in map_data[channel]:
+            if channel == "open_doors":
+                step["data"] = sorted(sorted(door) for door in step["data"])
+            else:
+                step["data"].sort(key=lambda item: json.dumps(item, sort_keys=True))
+    return map_data
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("num_agents", [3, 6, 9])
+def test_round_trip(tmp_path, seed, num_agents):
+    path = str(tmp_path / "steps.bin")
+    map_data = run_simulation(MapModel(num_agents, seed=seed, log_level=SILENT))
+    summary = record_simulation(MapModel(num_agents, seed=seed, log_level=SILENT), path, binary=True)
+    with BinaryTrajectory(path) as trajectory:
+        assert (trajectory.height, trajectory.width, trajectory.max_agents) == (8, 10, num_agents)
+        assert trajectory.summary == summary
+        assert trajectory[-1] == trajectory[len(trajectory) - 1]
+        assert canonical(trajectory.to_map_data()) == canonical(map_data)
@@ -0,0 +1,36 @@
+# Pruebas del formato delta (delta.py); se corren con python -m pytest desde Servers
+import json
+
+import pytest
+
+from delta import decode_deltas, encode_deltas
+from events import SILENT
+from model import MapModel
+from runner import run_simulation
+
+
+# map_data con el orden que produce decode_deltas (agentes por agent_id, celdas y puertas por posición)
+def canonical(map_data):
+    map_data = json.loads(json.dumps(map_data))
+    for step in map_data["agents"]:
+        step["data"].sort(key=lambda agent: agent["agent_id"])
+    for channel in ("fire_expansion", "smoke_expansion"):
+        for step in map_data[channel]:
+            step["data"].sort(key=lambda cell: cell["position"])
+    for step in map_data["open_doors"]:
+        step["data"] = sorted(sorted(door) for door in step["data"])
+    return map_data
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("keyframe_interval", [1, 3, 10])
+def test_round_trip(seed, keyframe_interval):
+    map_data = run_simulation(MapModel(6, seed=seed, log_level=SILENT))
+    payload = json.loads(json.dumps(encode_deltas(map_data, keyframe_interval)))
+    assert decode_deltas(payload) == canonical(map_data)
+
+
+@pytest.mark.parametrize("keyframe_interval", [0, -1, 2.5, True])
+def test_invalid_keyframe_interval(keyframe_interval):
+    with pytest.raises(ValueError):
+        encode_deltas([], keyframe_interval)
@@ -0,0 +1,50 @@
+# Pruebas del lector de mapas (maps.py); se corren con python -m pytest desde Servers
+import os
+
+import pytest
+
+from maps import MapFormatError, parse_map_lines
+
+FINAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'final.txt')
+
+
+def final_lines():
+    with open(FINAL) as map_file:
+        return map_file.read().splitlines()
+
+
+def test_final_map():
+    game_map = parse_map_lines(final_lines())
+    assert (game_map.height, game_map.width) == (8, 10)
+    assert (len(game_map.alerts), len(game_map.fires), len(game_map.doors), len(game_map.exits)) == (3, 10, 8, 4)
+
+
+def test_no_doors_is_ambiguous():
+    lines = [line for line in final_lines() if len(line.split()) != 4 or len(line.split()[0]) == 4]
+    with pytest.raises(MapFormatError):
+        parse_map_lines(lines)
+
+
+def test_no_doors_with_headers():
+    lines = final_lines()
+    walls, alerts, fires, exits = lines[:6], lines[6:9], lines[9:19], lines[27:]
+    game_map = parse_map_lines(walls + ["alerts"] + alerts + ["fires"] + fires + ["exits"] + exits)
+    assert len(game_map.fires) == 10
+    assert game_map.doors == ()
+    assert game_map.exits == ((1, 6), (3, 1), (4, 8), (6, 3))
+
+
+def test_no_fires():
+    lines = final_lines()
+    game_map = parse_map_lines(lines[:9] + lines[19:])
+    assert game_map.fires == ()
+    assert len(game_map.doors) == 8
+    assert game_map.exits == ((1, 6), (3, 1), (4, 8), (6, 3))
+
+
+def test_line_after_header_must_match_section():
+    lines = final_lines()
+    with pytest.raises(MapFormatError):
+        parse_map_lines(lines[:6] + ["fires", "2 4 v"])
+    with pytest.raises(MapFormatError):
+        parse_map_lines(lines[:6] + ["fires", "2 2", "alerts", "2 4 v"])
@@ -0,0 +1,74 @@
+# Pruebas de los costos de los caminos (pathfinding.py y MapModel.path_cost); se corren con python -m pytest desde Servers
+import heapq
+
+import pytest
+
+from events import SILENT
+from model import MapModel
+
+SIDES = (("up", "down", -1, 0), ("left", "right", 0, -1), ("down", "up", 1, 0), ("right", "left", 0, 1))
+
+
+# Dijkstra directo sobre las celdas del modelo, sin la tabla de EdgeCosts ni los campos guardados
+def reference_costs(model, start, lleva_puffle):
+    dist = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        d, (x, y) = heapq.heappop(heap)
+        if d > dist[(x, y)]:
+            continue
+        cell = model.cells[x][y]
+        for side, opposite, dx, dy in SIDES:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < model.height and 0 <= ny < model.width):
+                continue
+            neighbor = model.cells[nx][ny]
+            cost = model.move_cost * lleva_puffle
+            if getattr(cell, side) or getattr(neighbor, opposite):
+                cost += model.door_cost if (nx, ny) in cell.door else model.wall_cost
+            if neighbor.fire == 2:
+                cost += model.fire_cost
+            if d + cost < dist.get((nx, ny), float('inf')):
+                dist[(nx, ny)] = d + cost
+                heapq.heappush(heap, (d + cost, (nx, ny)))
+    return dist
+
+
+def assert_costs_match(model):
+    positions = [(x, y) for x in range(model.height) for y in range(model.width)]
+    for lleva_puffle in (1, 2):
+        for start in positions:
+            expected = reference_costs(model, start, lleva_puffle)
+            for end in positions:
+                assert model.path_cost(start, end, lleva_puffle) == pytest.approx(expected[end] if end != start else 0)
+
+
+def test_path_cost_matches_reference_after_board_changes():
+    model = MapModel(6, seed=0, log_level=SILENT)
+    assert_costs_match(model)
+
+    # Paredes interiores sin puerta, horizontales y verticales
+    walls = [(cell.pos, (cell.pos[0], cell.pos[1] + 1)) for row in model.cells[1:-1] for cell in row[1:-2]
+             if cell.right and (cell.pos[0], cell.pos[1] + 1) not in cell.door]
+    walls += [(cell.pos, (cell.pos[0] + 1, cell.pos[1])) for row in model.cells[1:-2] for cell in row[1:-1]
+              if cell.down and (cell.pos[0] + 1, cell.pos[1]) not in cell.door]
+    for start, end in walls[::3]:
+        model.remove_wall(start, end)
+    assert_costs_match(model)
+
+    doors = []
+    for row in model.cells:
+        for cell in row:
+            for side, _, dx, dy in SIDES[2:]:
+                neighbor = (cell.pos[0] + dx, cell.pos[1] + dy)
+                if neighbor in cell.door:
+                    doors.append((cell, model.cells[neighbor[0]][neighbor[1]], 2 if side == "down" else 3))
+    assert doors
+    for cell1, cell2, direction in doors[::2]:
+        model.remove_door(cell1, cell2, direction)
+    assert_costs_match(model)
+
+    # El fuego encarece las aristas que llegan a la celda; el humo no
+    for x, y, state in ((2, 2, 2), (3, 4, 2), (4, 6, 1), (2, 2, 0)):
+        model.set_fire(model.cells[x][y], state)
+    assert_costs_match(model)
@@ -0,0 +1,96 @@
+# Librerías
+import json
+import os
+import time
+
+# Canales de map_data y el campo donde va el valor de cada paso
+CHANNELS = {
+    "agents": "data",
+    "fire_expansion": "data",
+    "smoke_expansion": "data",
+    "pois": "data",
+    "victims_dead": "count",
+    "agents_dead": "count",
+    "saved_lifes": "count",
+    "structural_damage_left": "value",
+    "destroyed_doors": "data",
+    "destroyed_walls": "data",
+    "open_doors": "data",
+}
+
+# Función que arma map_data (el formato que consume Unity) a partir de los registros de cada paso
+def build_map_data(records):
+    map_data = {channel: [] for channel in CHANNELS}
+    for record in records:
+        if record.get("type", "step") != "step":
+            continue
+        for channel, field in CHANNELS.items():
+            map_data[channel].append({"step": record["step"], field: record[channel]})
+    return map_data
+
+
+# Escritor de trayectorias en NDJSON: una línea JSON por paso, escrita en cuanto el paso termina
+class TrajectoryWriter():
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync  # True también sincroniza a disco cada paso (sobrevive a un apagón, no solo a un fallo del proceso)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def close(self, summary=None):
+        """Cierra el archivo; si se da summary se escribe un registro final {"type": "end", ...}."""
+        if summary is not None:
+            self.write(dict(summary, type="end"))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self.file.closed:
+            self.file.close()
+
+
+# Función que lee los registros de una trayectoria; una última línea incompleta (corrida interrumpida) se ignora
+def read_trajectory(path):
+    with open(path, 'r', encoding='utf-8') as trajectory_file:
+        for line in trajectory_file:
+            if not line.endswith('\n'):
+                break
+            yield json.loads(line)
+
+
+# Función que sigue una trayectoria mientras se escribe (como tail -f) hasta el registro final o hasta timeout segundos sin datos
+def tail_trajectory(path, poll_interval=0.2, timeout=None):
+    waited = 0
+    while not os.path.exists(path):
+        if timeout is not None and waited >= timeout:
+            return
+        time.sleep(poll_interval)
+        waited += poll_interval
+
+    with open(path, 'r', encoding='utf-8') as trajectory_file:
+        buffer = ''
+        waited = 0
+        while True:
+            chunk = trajectory_file.readline()
+            if not chunk:
+                if timeout is not None and waited >= timeout:
+                    return
+                time.sleep(poll_interval)
+                waited += poll_interval
+                continue
+            waited = 0
+            buffer += chunk
+            if not buffer.endswith('\n'):
+                continue
+            record = json.loads(buffer)
+            buffer = ''
+            yield record
+            if record.get("type") == "end":
+                return